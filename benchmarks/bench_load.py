@@ -0,0 +1,340 @@
+"""
+Load benchmark for the dapp's read and write paths against a local dev chain.
+
+Deploys the contracts with a mock price feed (see local_chain.py), seeds
+players and cards, stubs Pinata/IPFS with a local HTTP server and times:
+
+- the chain index build and incremental sync behind app.py's views
+- get_all_cards / get_cards_for_player (index queries)
+- display_cards_for_sale (marketplace pages, plus the old full-scan read)
+- update_fantasy_points_on_chain (per-card submits) and the batched season sync
+- leaderboard top-K and per-card points history reads
+- the notebook scoring step
+- lambda_handler (via moto's in-process S3)
+
+Start a chain first, e.g. `anvil --accounts 1 --balance 1000000`, then:
+
+    python benchmarks/bench_load.py --players 2000 --openzeppelin node_modules/@openzeppelin/contracts \\
+        --output results.json [--baseline previous.json]
+
+Results are written as JSON; with --baseline, medians that regressed by more
+than --tolerance are reported and the exit status is 1.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import importlib.util
+from pathlib import Path
+
+from web3 import Web3
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS = ROOT / "scripts"
+PAGE_SIZE = 50
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+# ===================== Timing =====================
+class Recorder:
+    def __init__(self):
+        self.results = {}
+
+    def measure(self, name, fn, repeat=1):
+        """Time fn() `repeat` times, keep the summary and return the last result."""
+        durations = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            durations.append(time.perf_counter() - start)
+        self.record(name, durations)
+        return result
+
+    def record(self, name, durations):
+        ordered = sorted(durations)
+        self.results[name] = {
+            "runs": len(ordered),
+            "mean_s": statistics.mean(ordered),
+            "median_s": statistics.median(ordered),
+            "p95_s": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+            "min_s": ordered[0],
+            "max_s": ordered[-1],
+        }
+        log(f"{name:<45} median {self.results[name]['median_s'] * 1000:10.2f} ms over {len(ordered)} run(s)")
+
+
+def compare(results, baseline, tolerance):
+    """Return [(name, baseline median, current median)] for medians that regressed beyond tolerance."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous and current["median_s"] > previous["median_s"] * (1 + tolerance):
+            regressions.append((name, previous["median_s"], current["median_s"]))
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ===================== Scenarios =====================
+def bench_chain(recorder, args, ipfs):
+    from local_chain import compile_contracts, deploy, seed
+    import pinata
+    from indexer import ChainIndexer
+    from card_index import CardIndex
+    from leaderboard import Leaderboards, PointsHistory
+    from tx_manager import TransactionManager
+    from rpc_batch import fetch_cards
+    from points_sync import sync_season_points
+
+    w3 = Web3(Web3.HTTPProvider(args.rpc, request_kwargs={'timeout': 60}))
+    admin = w3.eth.accounts[0]
+
+    log("Compiling and deploying contracts")
+    registration, card, _ = deploy(w3, compile_contracts(args.openzeppelin, args.solc_version), admin)
+    seeded = recorder.measure("seed.players_and_cards", lambda: seed(
+        w3, registration, card, admin, ipfs,
+        players=args.players, cards_per_player=args.cards_per_player, listed_fraction=args.listed_fraction, log=log
+    ))
+
+    # Index build: every event plus one IPFS metadata fetch per player, from a cold cache
+    db_path = os.path.join(args.workdir, "chain_index.sqlite3")
+    indexer = ChainIndexer(w3, registration, card, db_path, fetch_metadata=pinata.fetch_from_ipfs)
+    recorder.measure("indexer.sync.cold", indexer.sync)
+    recorder.measure("indexer.sync.caught_up", indexer.sync, repeat=args.repeat)
+    recorder.measure("indexer.refresh_sale_prices", indexer.refresh_sale_prices)
+    card_index = CardIndex()
+    recorder.measure("card_index.load", lambda: card_index.load(indexer.all_cards()))
+    card_leaderboards, points_history = Leaderboards(), PointsHistory()
+    recorder.measure("leaderboards.load", lambda: card_leaderboards.load_cards(indexer.all_cards()))
+    recorder.measure("points_history.load", lambda: points_history.load(indexer.points_history()))
+    for listener in (card_index, card_leaderboards, points_history):
+        indexer.add_listener(listener.on_chain_event)
+
+    sample = seeded["cards"][len(seeded["cards"]) // 2]
+    full_name = sample["full_name"]
+
+    # get_all_cards / get_cards_for_player
+    recorder.measure("get_all_cards.page", lambda: indexer.all_cards(PAGE_SIZE, 0), repeat=args.repeat)
+    recorder.measure("get_all_cards.full", indexer.all_cards, repeat=args.repeat)
+    recorder.measure("get_cards_for_player", lambda: indexer.cards_for_player(full_name, PAGE_SIZE, 0), repeat=args.repeat)
+
+    # display_cards_for_sale
+    recorder.measure("display_cards_for_sale.first_page", lambda: indexer.listed_cards(limit=PAGE_SIZE), repeat=args.repeat)
+    recorder.measure("display_cards_for_sale.filtered_page", lambda: indexer.listed_cards(
+        league=sample["league"], season=sample["season"], position=sample["position"], limit=PAGE_SIZE
+    ), repeat=args.repeat)
+    recorder.measure("display_cards_for_sale.points_desc", lambda: indexer.listed_cards(
+        sort="points", descending=True, limit=PAGE_SIZE
+    ), repeat=args.repeat)
+
+    def walk_pages(pages=5):
+        cursor = None
+        for _ in range(pages):
+            _, cursor = indexer.listed_cards(cursor=cursor, limit=PAGE_SIZE)
+            if cursor is None:
+                break
+
+    recorder.measure("display_cards_for_sale.five_pages", walk_pages, repeat=args.repeat)
+    recorder.measure("display_cards_for_sale.full_chain_scan", lambda: fetch_cards(
+        w3, card, card.functions.getAllCardIds().call()
+    ), repeat=max(1, args.repeat // 5))
+
+    # update_fantasy_points_on_chain: submit one transaction per active card, then wait for the poller
+    tx_manager = TransactionManager(w3, poll_interval=0.05)
+    card_ids = card_index.active_card_ids(full_name, sample["league"], sample["season"])
+
+    def submit_updates():
+        return [
+            tx_manager.submit(f"Update fantasy points for card ID {card_id}",
+                              card.functions.updateFantasyPoints(card_id, 1000), {'from': admin})
+            for card_id in card_ids
+        ]
+
+    tx_hashes = recorder.measure("update_fantasy_points_on_chain.submit", submit_updates)
+    start = time.perf_counter()
+    while any(tx_manager.status(tx_hash)["status"] == "pending" for tx_hash in tx_hashes):
+        time.sleep(0.01)
+    recorder.record("update_fantasy_points_on_chain.confirmed", [time.perf_counter() - start])
+
+    # Admin "Sync Season Fantasy Points": diff against chain and push gas-bounded batches
+    points_table = {
+        (entry["full_name"], entry["league"], entry["season"], "Hodler Miami FC"): entry["fantasy_points"] + 1
+        for entry in seeded["cards"]
+    }
+    league, season = sample["league"], sample["season"]
+    summary = recorder.measure("sync_season_points.submit", lambda: sync_season_points(
+        w3, tx_manager, card, admin, indexer.all_cards(), points_table, league, season
+    ))
+    batch_hashes = [tx_hash for _, tx_hash in summary["results"] if not isinstance(tx_hash, Exception)]
+    start = time.perf_counter()
+    while any(tx_manager.status(tx_hash)["status"] == "pending" for tx_hash in batch_hashes):
+        time.sleep(0.01)
+    recorder.record("sync_season_points.confirmed", [time.perf_counter() - start])
+    recorder.measure("indexer.sync.after_points_update", indexer.sync)
+
+    # Standings and points-over-time, now that some cards have more than one point value
+    recorder.measure("leaderboards.top_10", lambda: card_leaderboards.top(league, season, sample["position"], 10),
+                     repeat=args.repeat)
+    recorder.measure("leaderboards.top_10_all_positions", lambda: card_leaderboards.top(league, season, None, 10),
+                     repeat=args.repeat)
+    recorder.measure("points_history.series", lambda: points_history.series(card_ids[0] if card_ids else sample["card_id"]),
+                     repeat=args.repeat)
+
+    return {
+        "players": seeded["players"],
+        "cards": len(seeded["cards"]),
+        "listed": seeded["listed"],
+        "season_sync_updated_cards": summary["updated_cards"],
+    }, seeded
+
+
+def bench_scoring(recorder, args):
+    import pandas as pd
+    from scoring import load_match_stats, calculate_fantasy_points_vectorized, aggregate_fantasy_points, build_points_json
+
+    base = load_match_stats(ROOT / "resources" / "HMFC_2023-1.xlsx")
+    df = pd.concat([base] * -(-args.scoring_rows // len(base))).iloc[:args.scoring_rows].copy()
+
+    def score():
+        df['Fantasy Points'] = calculate_fantasy_points_vectorized(df)
+        return build_points_json(aggregate_fantasy_points(df))
+
+    recorder.measure("scoring.notebook_step", score, repeat=args.repeat)
+
+
+def bench_lambda(recorder, args, seeded):
+    try:
+        from moto import mock_aws
+    except ImportError:
+        log("moto is not installed; skipping lambda_handler")
+        return
+
+    dataset = {}
+    for entry in seeded["cards"]:
+        dataset.setdefault(entry["full_name"], []).append({
+            "Fantasy Points": entry["fantasy_points"],
+            "League": entry["league"],
+            "Season": entry["season"],
+            "Team": "Hodler Miami FC",
+            "Position": entry["position"],
+        })
+
+    for key, value in (("AWS_ACCESS_KEY_ID", "testing"), ("AWS_SECRET_ACCESS_KEY", "testing"),
+                       ("AWS_DEFAULT_REGION", "us-east-1"), ("BUCKET_NAME", "hodler-bucket"),
+                       ("FILE_KEY", "hodlerfc.json")):
+        os.environ[key] = value
+    os.environ.pop("S3_ENDPOINT_URL", None)
+
+    with mock_aws():
+        # lambda.py can't be imported by name; load it from its path inside the mock
+        spec = importlib.util.spec_from_file_location("fantasy_points_lambda", SCRIPTS / "lambda.py")
+        handler = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(handler)
+        handler.s3.create_bucket(Bucket="hodler-bucket")
+        handler.s3.put_object(Bucket="hodler-bucket", Key="hodlerfc.json", Body=json.dumps(dataset).encode("utf-8"))
+
+        sample = seeded["cards"][0]
+        get_event = {"queryStringParameters": {
+            "playerName": sample["full_name"], "league": sample["league"],
+            "season": sample["season"], "team": "Hodler Miami FC",
+        }}
+        batch_event = {"httpMethod": "POST", "body": json.dumps({"queries": [
+            {"playerName": entry["full_name"], "league": entry["league"], "season": entry["season"], "team": "Hodler Miami FC"}
+            for entry in seeded["cards"][:100]
+        ]})}
+        season_event = {"httpMethod": "POST", "body": json.dumps({"league": sample["league"], "season": sample["season"]})}
+
+        def cold_get():
+            handler.clear_cache()
+            return handler.lambda_handler(get_event, None)
+
+        recorder.measure("lambda_handler.cold_get", cold_get, repeat=args.repeat)
+        handler.lambda_handler(get_event, None)
+        recorder.measure("lambda_handler.warm_get", lambda: handler.lambda_handler(get_event, None), repeat=args.repeat)
+        recorder.measure("lambda_handler.batch_100", lambda: handler.lambda_handler(batch_event, None), repeat=args.repeat)
+        recorder.measure("lambda_handler.season", lambda: handler.lambda_handler(season_event, None), repeat=args.repeat)
+
+
+# ===================== Main =====================
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rpc", default=os.getenv("WEB3_PROVIDER_URI", "http://127.0.0.1:8545"))
+    parser.add_argument("--openzeppelin", type=Path, default=ROOT / "node_modules" / "@openzeppelin" / "contracts",
+                        help="contracts/ directory of OpenZeppelin v4.3.2")
+    parser.add_argument("--solc-version", default="0.8.9")
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--cards-per-player", type=int, default=2)
+    parser.add_argument("--listed-fraction", type=float, default=0.25)
+    parser.add_argument("--ipfs-latency-ms", type=float, default=20.0, help="simulated gateway latency")
+    parser.add_argument("--scoring-rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", type=Path, default=Path("load_results.json"))
+    parser.add_argument("--baseline", type=Path, help="earlier results file to compare medians against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed median slowdown before flagging")
+    args = parser.parse_args()
+    # Relative paths are relative to where the benchmark was started, not scripts/ (see chdir below)
+    for name in ("openzeppelin", "output", "baseline"):
+        if getattr(args, name) is not None:
+            setattr(args, name, getattr(args, name).resolve())
+
+    from local_chain import IPFSStub
+
+    with tempfile.TemporaryDirectory() as workdir, IPFSStub(latency=args.ipfs_latency_ms / 1000) as ipfs:
+        args.workdir = workdir
+        # Point the app modules at the stub and at empty caches before they are imported
+        os.environ.update({
+            "PINATA_API_URL": ipfs.url,
+            "IPFS_GATEWAYS": ipfs.gateway,
+            "IPFS_CACHE_PATH": os.path.join(workdir, "ipfs_cache.sqlite3"),
+            "WEB3_PROVIDER_URI": args.rpc,
+        })
+        # The app modules resolve ../SAMPLE.env and ../metadata relative to scripts/
+        os.chdir(SCRIPTS)
+        sys.path.insert(0, str(SCRIPTS))
+        sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+        recorder = Recorder()
+        dataset, seeded = bench_chain(recorder, args, ipfs)
+        bench_scoring(recorder, args)
+        bench_lambda(recorder, args, seeded)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rpc": args.rpc,
+            "ipfs_latency_ms": args.ipfs_latency_ms,
+            "scoring_rows": args.scoring_rows,
+            "repeat": args.repeat,
+            **dataset,
+        },
+        "results": recorder.results,
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    log(f"Wrote {args.output}")
+
+    if args.baseline:
+        regressions = compare(recorder.results, json.loads(args.baseline.read_text())["results"], args.tolerance)
+        for name, previous, current in regressions:
+            log(f"REGRESSION {name}: {previous * 1000:.2f} ms -> {current * 1000:.2f} ms")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Row-wise vs vectorized vs rules-compiled fantasy points scoring.
+
+Replicates the HMFC_2023-1.xlsx "Fantasy" sheet up to the requested row
+counts, times each implementation and checks they produce identical totals.
+
+    python benchmarks/bench_scoring.py --rows 10000 100000 1000000 5000000
+"""
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from scoring import load_match_stats, calculate_fantasy_points, calculate_fantasy_points_vectorized
+from scoring_rules import load_rules, compile_rules
+
+
+def replicate(df, rows):
+    repeats = -(-rows // len(df))  # ceil division
+    return pd.concat([df] * repeats).iloc[:rows]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000, 5_000_000])
+    parser.add_argument("--max-rowwise-rows", type=int, default=1_000_000,
+                        help="skip the (slow) row-wise run above this many rows")
+    parser.add_argument("--excel", type=Path, default=ROOT / "resources" / "HMFC_2023-1.xlsx")
+    args = parser.parse_args()
+
+    base = load_match_stats(args.excel)
+    plan = compile_rules(load_rules(ROOT / "metadata" / "scoring_rules.json"))
+    print(f"{'rows':>10} {'row-wise (s)':>14} {'vectorized (s)':>16} {'rules (s)':>11} {'speedup':>9}")
+
+    for rows in args.rows:
+        df = replicate(base, rows)
+        vectorized, vectorized_seconds = timed(calculate_fantasy_points_vectorized, df)
+        ruled, rules_seconds = timed(plan.evaluate, df)
+        if not np.array_equal(ruled.to_numpy(dtype=float), vectorized.to_numpy(dtype=float)):
+            raise SystemExit(f"Rules-compiled totals differ from vectorized totals at {rows} rows")
+
+        if rows > args.max_rowwise_rows:
+            print(f"{rows:>10} {'skipped':>14} {vectorized_seconds:>16.4f} {rules_seconds:>11.4f} {'-':>9}")
+            continue
+
+        rowwise, rowwise_seconds = timed(lambda frame: frame.apply(calculate_fantasy_points, axis=1), df)
+        if not np.array_equal(rowwise.to_numpy(dtype=float), vectorized.to_numpy(dtype=float)):
+            raise SystemExit(f"Vectorized totals differ from row-wise totals at {rows} rows")
+
+        print(f"{rows:>10} {rowwise_seconds:>14.4f} {vectorized_seconds:>16.4f} {rules_seconds:>11.4f} {rowwise_seconds / vectorized_seconds:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Streamlit app startup and rerun timing.
+
+Runs scripts/app.py headlessly with Streamlit's AppTest harness, timing the
+first (cold) run, which builds the cached resources and paints the first
+page, and the reruns that follow, which should only read cached state.
+
+Against the chain in SAMPLE.env:
+
+    python benchmarks/bench_startup.py --reruns 10
+
+With --cards, the contracts are deployed to a local dev chain (see
+local_chain.py) and the league is grown to each size in turn. Every size is
+measured in a fresh process with an empty chain index, so the report shows
+whether time-to-first-paint stays flat as the league grows:
+
+    python benchmarks/bench_startup.py --cards 100,1000,5000 \\
+        --openzeppelin node_modules/@openzeppelin/contracts
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+APP = ROOT / "scripts" / "app.py"
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+def timed_run(app, timeout):
+    start = time.perf_counter()
+    app.run(timeout=timeout)
+    elapsed = time.perf_counter() - start
+    if app.exception:
+        raise RuntimeError(f"app.py raised: {app.exception[0].value}")
+    return elapsed
+
+
+def measure_app(reruns, timeout):
+    """Cold run plus `reruns` warm runs of app.py in this process."""
+    from streamlit.testing.v1 import AppTest
+
+    # app.py resolves ../SAMPLE.env, ../metadata and its imports relative to scripts/
+    os.chdir(APP.parent)
+    sys.path.insert(0, str(APP.parent))
+
+    app = AppTest.from_file(str(APP), default_timeout=timeout)
+    cold = timed_run(app, timeout)
+    warm = [timed_run(app, timeout) for _ in range(reruns)]
+    return {
+        "cold_start_seconds": round(cold, 4),
+        "rerun_seconds": {
+            "runs": len(warm),
+            "mean": round(statistics.mean(warm), 4) if warm else None,
+            "median": round(statistics.median(warm), 4) if warm else None,
+            "max": round(max(warm), 4) if warm else None,
+        },
+    }
+
+
+def measure_sizes(args):
+    """Grow one local deployment to each card count and time a fresh app process at each size."""
+    sys.path.insert(0, str(APP.parent))
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from web3 import Web3
+    from local_chain import compile_contracts, deploy, seed, IPFSStub
+
+    w3 = Web3(Web3.HTTPProvider(args.rpc, request_kwargs={'timeout': 60}))
+    admin = w3.eth.accounts[0]
+    log("Compiling and deploying contracts")
+    registration, card, _ = deploy(w3, compile_contracts(args.openzeppelin, args.solc_version), admin)
+
+    sizes = []
+    seeded_cards = 0
+    with tempfile.TemporaryDirectory() as workdir, IPFSStub() as ipfs:
+        for target in sorted(args.cards):
+            players = -(-(target - seeded_cards) // args.cards_per_player)
+            if players > 0:
+                seed(w3, registration, card, admin, ipfs, players=players,
+                     cards_per_player=args.cards_per_player, log=log)
+                seeded_cards += players * args.cards_per_player
+
+            # A fresh process and index per size, so nothing cached from a smaller league carries over
+            output = Path(workdir) / f"startup_{seeded_cards}.json"
+            env = {
+                **os.environ,
+                "WEB3_PROVIDER_URI": args.rpc,
+                "PLAYER_REGISTRATION_CONTRACT_ADDRESS": registration.address,
+                "PLAYER_CARD_CONTRACT_ADDRESS": card.address,
+                "INDEX_DB_PATH": os.path.join(workdir, f"chain_index_{seeded_cards}.sqlite3"),
+                "IPFS_CACHE_PATH": os.path.join(workdir, f"ipfs_cache_{seeded_cards}.sqlite3"),
+                "IPFS_GATEWAYS": ipfs.gateway,
+                "PINATA_API_URL": ipfs.url,
+            }
+            subprocess.run([sys.executable, __file__, "--reruns", str(args.reruns), "--timeout", str(args.timeout),
+                            "--output", str(output)], env=env, check=True)
+            result = json.loads(output.read_text())
+            sizes.append({"cards": seeded_cards, **result})
+            log(f"{seeded_cards:>8} cards: first paint {result['cold_start_seconds'] * 1000:9.1f} ms")
+
+    first_paint = [size["cold_start_seconds"] for size in sizes]
+    return {
+        "sizes": sizes,
+        # 1.0 means first paint did not grow at all from the smallest to the largest league
+        "first_paint_growth": round(first_paint[-1] / first_paint[0], 3) if first_paint and first_paint[0] else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds allowed per script run")
+    parser.add_argument("--output", type=Path, help="also write the results to this JSON file")
+    parser.add_argument("--cards", type=lambda value: [int(size) for size in value.split(",")],
+                        help="comma-separated league sizes to seed on a local chain, e.g. 100,1000,5000")
+    parser.add_argument("--cards-per-player", type=int, default=2)
+    parser.add_argument("--rpc", default="http://127.0.0.1:8545", help="local dev chain used with --cards")
+    parser.add_argument("--openzeppelin", type=Path, default=ROOT / "node_modules" / "@openzeppelin" / "contracts",
+                        help="contracts/ directory of OpenZeppelin v4.3.2 (with --cards)")
+    parser.add_argument("--solc-version", default="0.8.9")
+    args = parser.parse_args()
+    # Relative paths are relative to where the benchmark was started, not scripts/
+    args.openzeppelin = args.openzeppelin.resolve()
+    if args.output:
+        args.output = args.output.resolve()
+
+    results = measure_sizes(args) if args.cards else measure_app(args.reruns, args.timeout)
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
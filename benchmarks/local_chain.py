@@ -0,0 +1,368 @@
+"""
+Local dev-chain fixtures for the load benchmarks.
+
+- Compiles contracts/*.sol with py-solc-x. The contracts import OpenZeppelin
+  and Chainlink by GitHub URL (as Remix does); OpenZeppelin v4.3.2 is read
+  from a local checkout and the Chainlink interface is inlined.
+- Deploys PlayerRegistration, a mock Chainlink ETH/USD feed and PlayerCard.
+- Seeds players and cards from locally generated accounts.
+- Serves a stub of the Pinata pinning API and an IPFS gateway over HTTP.
+
+Needs a dev chain with an unlocked, funded first account (anvil, ganache).
+"""
+import io
+import re
+import json
+import random
+import hashlib
+import posixpath
+import threading
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+ROOT = Path(__file__).resolve().parents[1]
+CONTRACTS = ROOT / "contracts"
+
+OPENZEPPELIN_URL = "https://github.com/OpenZeppelin/openzeppelin-contracts/blob/v4.3.2/contracts/"
+CHAINLINK_URL = "https://github.com/smartcontractkit/chainlink/blob/develop/contracts/src/v0.8/interfaces/AggregatorV3Interface.sol"
+
+CHAINLINK_INTERFACE = """// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+interface AggregatorV3Interface {
+    function decimals() external view returns (uint8);
+    function description() external view returns (string memory);
+    function version() external view returns (uint256);
+    function getRoundData(uint80 _roundId) external view returns (uint80, int256, uint256, uint256, uint80);
+    function latestRoundData() external view returns (uint80, int256, uint256, uint256, uint80);
+}
+"""
+
+MOCK_PRICE_FEED = """// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+import "%s";
+
+contract MockV3Aggregator is AggregatorV3Interface {
+    uint8 public override decimals;
+    int256 public latestAnswer;
+
+    constructor(uint8 _decimals, int256 _initialAnswer) {
+        decimals = _decimals;
+        latestAnswer = _initialAnswer;
+    }
+
+    function description() external pure override returns (string memory) {
+        return "ETH / USD (mock)";
+    }
+
+    function version() external pure override returns (uint256) {
+        return 0;
+    }
+
+    function getRoundData(uint80 _roundId) external view override returns (uint80, int256, uint256, uint256, uint80) {
+        return (_roundId, latestAnswer, block.timestamp, block.timestamp, _roundId);
+    }
+
+    function latestRoundData() external view override returns (uint80, int256, uint256, uint256, uint80) {
+        return (1, latestAnswer, block.timestamp, block.timestamp, 1);
+    }
+}
+""" % CHAINLINK_URL
+
+POSITIONS = ["GOA", "DEF", "MID", "STK"]
+LEAGUES = ["UPSL_Division_1", "USSL_Elite", "PFL_Division_1"]
+SEASONS = ["2023_Spring", "2023_Fall"]
+TEAM = "Hodler Miami FC"
+
+IMPORT_PATTERN = re.compile(r'^\s*import\s+(?:[^"\']*\s+from\s+)?["\']([^"\']+)["\']', re.MULTILINE)
+
+
+# ===================== Compilation =====================
+def _resolve_import(unit, path):
+    """Resolve an import the way solc does: relative to the importing unit's directory."""
+    if not path.startswith("."):
+        return path
+    scheme, separator, rest = unit.rpartition("://")
+    return scheme + separator + posixpath.normpath(posixpath.join(posixpath.dirname(rest), path))
+
+
+def _read_source(unit, openzeppelin_dir):
+    if unit == CHAINLINK_URL:
+        return CHAINLINK_INTERFACE
+    if unit.startswith(OPENZEPPELIN_URL):
+        return (Path(openzeppelin_dir) / unit[len(OPENZEPPELIN_URL):]).read_text()
+    return (CONTRACTS / unit).read_text()
+
+
+def _collect_sources(entry_units, openzeppelin_dir, inline=None):
+    sources = dict(inline or {})
+    queue = list(entry_units) + list(sources)
+    while queue:
+        unit = queue.pop()
+        if unit not in sources:
+            sources[unit] = _read_source(unit, openzeppelin_dir)
+        for path in IMPORT_PATTERN.findall(sources[unit]):
+            imported = _resolve_import(unit, path)
+            if imported not in sources:
+                queue.append(imported)
+    return {unit: {"content": content} for unit, content in sources.items()}
+
+
+def compile_contracts(openzeppelin_dir, solc_version="0.8.9"):
+    """
+    Return {contract name: (abi, bytecode)} for PlayerRegistration, PlayerCard
+    and MockV3Aggregator. `openzeppelin_dir` is the `contracts/` directory of
+    OpenZeppelin v4.3.2, e.g. node_modules/@openzeppelin/contracts.
+    """
+    import solcx
+
+    solcx.install_solc(solc_version)
+    sources = _collect_sources(
+        ["playerRegistration.sol", "playerCard.sol"],
+        openzeppelin_dir,
+        inline={"MockV3Aggregator.sol": MOCK_PRICE_FEED}
+    )
+    output = solcx.compile_standard({
+        "language": "Solidity",
+        "sources": sources,
+        "settings": {
+            # PlayerCard is over the 24 KB code size limit without the optimizer
+            "optimizer": {"enabled": True, "runs": 200},
+            "outputSelection": {"*": {"*": ["abi", "evm.bytecode.object"]}},
+        },
+    }, solc_version=solc_version)
+
+    compiled = {}
+    for unit, name in (("playerRegistration.sol", "PlayerRegistration"), ("playerCard.sol", "PlayerCard"),
+                       ("MockV3Aggregator.sol", "MockV3Aggregator")):
+        artifact = output["contracts"][unit][name]
+        compiled[name] = (artifact["abi"], artifact["evm"]["bytecode"]["object"])
+    return compiled
+
+
+# ===================== Deployment =====================
+def _deploy(w3, artifact, admin, *args):
+    abi, bytecode = artifact
+    tx_hash = w3.eth.contract(abi=abi, bytecode=bytecode).constructor(*args).transact({'from': admin})
+    receipt = w3.eth.waitForTransactionReceipt(tx_hash)
+    return w3.eth.contract(address=receipt['contractAddress'], abi=abi)
+
+
+def deploy(w3, compiled, admin, eth_price_usd=2000):
+    """Deploy the registry, a mock price feed and PlayerCard; returns (registration, card, feed)."""
+    registration = _deploy(w3, compiled["PlayerRegistration"], admin)
+    feed = _deploy(w3, compiled["MockV3Aggregator"], admin, 8, eth_price_usd * 10 ** 8)
+    card = _deploy(w3, compiled["PlayerCard"], admin, feed.address, registration.address)
+    return registration, card, feed
+
+
+# ===================== Seeding =====================
+class SignedSender:
+    """Builds, signs and sends transactions for one locally generated account."""
+
+    def __init__(self, w3, account, chain_id, gas_price):
+        self.w3 = w3
+        self.account = account
+        self.chain_id = chain_id
+        self.gas_price = gas_price
+        self.nonce = 0
+
+    @property
+    def address(self):
+        return self.account.address
+
+    def send(self, contract_function, gas, value=0):
+        tx = contract_function.buildTransaction({
+            'from': self.address,
+            'nonce': self.nonce,
+            'gas': gas,
+            'gasPrice': self.gas_price,
+            'chainId': self.chain_id,
+            'value': value,
+        })
+        self.nonce += 1
+        return self.w3.eth.sendRawTransaction(self.account.sign_transaction(tx).rawTransaction)
+
+
+def seed(w3, registration, card, admin, ipfs, players=1000, cards_per_player=2, listed_fraction=0.25,
+         fund_wei=10 ** 18, fan_out=None, log=print):
+    """
+    Register `players` players (metadata pinned to the IPFS stub), mint
+    `cards_per_player` cards each with random points, and list a fraction of
+    the cards for sale. Returns a summary including every seeded card.
+    """
+    import http_client
+    from rpc_batch import fetch_player_infos
+
+    fan_out = fan_out or http_client.fetch_many
+    rng = random.Random(42)
+    chain_id = w3.eth.chainId
+    gas_price = w3.eth.gasPrice
+    minting_fee = card.functions.calculateMintingFee().call()
+    senders = [SignedSender(w3, w3.eth.account.create(), chain_id, gas_price) for _ in range(players)]
+
+    log(f"Funding and waitlisting {players} players")
+    nonce = w3.eth.getTransactionCount(admin, 'pending')
+    last = None
+    for sender in senders:
+        w3.eth.sendTransaction({'from': admin, 'to': sender.address, 'value': fund_wei, 'gas': 21000,
+                                'gasPrice': gas_price, 'nonce': nonce})
+        last = registration.functions.addToWaitlist(sender.address).transact({
+            'from': admin, 'gas': 200_000, 'gasPrice': gas_price, 'nonce': nonce + 1
+        })
+        nonce += 2
+    w3.eth.waitForTransactionReceipt(last, timeout=600)
+
+    # Card attributes are drawn up front so a given seed always mints the same cards
+    names = {}
+    specs = [
+        [(rng.choice(LEAGUES), rng.choice(SEASONS), rng.choice(POSITIONS), rng.randint(0, 200))
+         for _ in range(cards_per_player)]
+        for _ in range(players)
+    ]
+
+    def register_and_mint(index):
+        sender = senders[index]
+        first_name, last_name = f"Load{index:05d}", "Player"
+        names[sender.address] = f"{first_name} {last_name}"
+        ipfs_hash = ipfs.add({"name": first_name, "lastName": last_name, "nationality": "United States"})
+        tx_hash = sender.send(registration.functions.registerPlayer(ipfs_hash), gas=400_000)
+        for league, season, position, points in specs[index]:
+            tx_hash = sender.send(
+                card.functions.mintCard(TEAM, position, league, season, "", points), gas=800_000, value=minting_fee
+            )
+        w3.eth.waitForTransactionReceipt(tx_hash, timeout=600)
+        return specs[index]
+
+    log(f"Registering players and minting {players * cards_per_player} cards")
+    minted = fan_out(register_and_mint, range(players))
+
+    # Card IDs derive from the player number the registry assigned on registration.
+    infos = fetch_player_infos(w3, registration, [sender.address for sender in senders])
+    cards = []
+    for sender, player_cards in zip(senders, minted):
+        player_number = infos[sender.address][0]
+        for count, (league, season, position, points) in enumerate(player_cards, start=1):
+            cards.append({
+                "card_id": player_number * 10 ** 6 + count,
+                "owner": sender.address,
+                "full_name": names[sender.address],
+                "league": league,
+                "season": season,
+                "position": position,
+                "fantasy_points": points,
+            })
+
+    log("Listing cards for sale")
+    by_owner = {sender.address: sender for sender in senders}
+
+    def list_cards(owner_cards):
+        tx_hash = None
+        for entry in owner_cards:
+            tx_hash = by_owner[entry["owner"]].send(
+                card.functions.setSalePrice(entry["card_id"], entry["sale_price"]), gas=100_000
+            )
+        if tx_hash is not None:
+            w3.eth.waitForTransactionReceipt(tx_hash, timeout=600)
+
+    listed = {}
+    for entry in cards:
+        if rng.random() < listed_fraction:
+            entry["sale_price"] = rng.randint(1, 500) * 10 ** 15
+            listed.setdefault(entry["owner"], []).append(entry)
+    fan_out(list_cards, list(listed.values()))
+
+    return {
+        "players": players,
+        "cards": cards,
+        "listed": sum(len(entries) for entries in listed.values()),
+        "minting_fee": minting_fee,
+    }
+
+
+# ===================== Pinata / IPFS Stub =====================
+class IPFSStub:
+    """
+    In-process HTTP stand-in for Pinata and an IPFS gateway.
+
+    POST /pinning/pinJSONToIPFS stores the body under a content hash and
+    /pinning/pinFileToIPFS stores the uploaded file under its real CIDv0;
+    GET /data/pinList?hashContains=<hash> reports whether it is pinned and
+    GET /ipfs/<hash> serves it back after `latency` seconds. Point
+    PINATA_API_URL at `url` and IPFS_GATEWAYS at `gateway`.
+    """
+
+    def __init__(self, latency=0.0, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.documents = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://{host}:{self._server.server_address[1]}"
+        self.gateway = f"{self.url}/ipfs/"
+        self._thread = threading.Thread(target=self._server.serve_forever, name="ipfs-stub", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_bytes(self, body):
+        ipfs_hash = "bafk" + hashlib.sha256(body).hexdigest()[:52]
+        with self._lock:
+            self.documents[ipfs_hash] = body
+        return ipfs_hash
+
+    def add(self, document):
+        return self.add_bytes(json.dumps(document, sort_keys=True).encode("utf-8"))
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, status, body=b"", content_type="application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.startswith("/data/pinList"):
+                    query = parse_qs(urlsplit(self.path).query)
+                    count = int(query.get("hashContains", [""])[0] in stub.documents)
+                    return self._reply(200, json.dumps({"count": count, "rows": []}).encode("utf-8"))
+                if not self.path.startswith("/ipfs/"):
+                    return self._reply(404)
+                if stub.latency:
+                    threading.Event().wait(stub.latency)
+                body = stub.documents.get(self.path[len("/ipfs/"):])
+                self._reply(200, body) if body is not None else self._reply(404)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path not in ("/pinning/pinJSONToIPFS", "/pinning/pinFileToIPFS"):
+                    return self._reply(404)
+                if self.path == "/pinning/pinFileToIPFS":
+                    from ipfs_cid import file_cid
+                    # Single-part body: the file sits between the part headers and the closing boundary
+                    boundary = self.headers["Content-Type"].split("boundary=")[1].encode("utf-8")
+                    content = body.split(b"\r\n\r\n", 1)[1].rsplit(b"\r\n--" + boundary, 1)[0]
+                    ipfs_hash = file_cid(io.BytesIO(content))
+                    with stub._lock:
+                        stub.documents[ipfs_hash] = content
+                else:
+                    ipfs_hash = stub.add_bytes(body)
+                self._reply(200, json.dumps({"IpfsHash": ipfs_hash, "PinSize": len(body)}).encode("utf-8"))
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -1,6 +1,6 @@
 import os
 import json
-import requests
+import threading
 import pycountry
 import phonenumbers
 from web3 import Web3
@@ -9,19 +9,47 @@ from pathlib import Path
 from decimal import Decimal
 from dotenv import load_dotenv
 
-from pinata import pin_file_to_ipfs, pin_json_to_ipfs, convert_data_to_json, fetch_from_ipfs
-
-# Initialize environment and web3
+import http_client
+import metrics
+from pinata import convert_data_to_json, fetch_from_ipfs
+from onboarding import pin_player
+from indexer import ChainIndexer
+from card_index import CardIndex
+from leaderboard import Leaderboards, PointsHistory
+from points_sync import load_points_table, fetch_season_points, sync_season_points
+from tx_manager import TransactionManager
+
+# Initialize environment
 load_dotenv('../SAMPLE.env')
-w3 = Web3(Web3.HTTPProvider(os.getenv("WEB3_PROVIDER_URI")))
+
+# Everything recorded from here to the end of the script belongs to this rerun
+rerun_metrics = metrics.Scope("streamlit_rerun").start(root=True)
 
 # Constants
 position_options = ["GOA", "DEF", "MID", "STK"]
 league_options = ["UPSL_Division_1", "USSL_Elite", "PFL_Division_1"]
 season_options = ["2023_Spring", "2023_Fall"]
 team_options = ["Hodler Miami FC"]
-
-# ===================== Contract Initialization =====================
+scoring_positions = {"GOA": "GK", "STK": "FWD"}  # Card positions as the stats sheet names them
+PAGE_SIZE = int(os.getenv("PAGE_SIZE", "50"))
+
+# Streamlit re-executes this script on every interaction. Everything below that
+# is process-wide (web3, ABIs, contracts, the index, the transaction manager)
+# is created once with st.cache_resource; each rerun only reads what its view needs.
+
+# ===================== Web3 and Contract Initialization =====================
+@st.cache_resource
+def get_web3():
+    provider_uri = os.getenv("WEB3_PROVIDER_URI")
+    w3 = Web3(Web3.HTTPProvider(
+        provider_uri,
+        request_kwargs={'timeout': http_client.DEFAULT_TIMEOUT},
+        session=http_client.get_session(provider_uri)
+    ))
+    w3.middleware_onion.add(metrics.web3_middleware, "metrics")
+    return w3
+
+@st.cache_resource
 def load_contracts():
     with open(Path('../metadata/player_registration_abi.json')) as f:
         player_registration_abi = json.load(f)
@@ -44,32 +72,103 @@ def load_contracts():
 
     return player_registration_contract, player_card_contract
 
-player_registration_contract, player_card_contract = load_contracts()
-ADMIN_ROLE = player_card_contract.functions.ADMIN_ROLE().call()
-
-# Global variable to maintain a mapping of card ID to player name
-card_id_to_player_name = {}
-
-# ===================== Fetch Player Data for All Cards =====================
-def fetch_player_data_for_all_cards():
-    global card_id_to_player_name
-    
-    # Fetch all card IDs
-    all_card_ids = player_card_contract.functions.getAllCardIds().call()
-
-    for card_id in all_card_ids:
-        player_address = player_card_contract.functions.cards(card_id).call()[0]
-        ipfs_hash = player_registration_contract.functions.playerInfos(player_address).call()[1]
-        player_data = fetch_from_ipfs(ipfs_hash)
-
-        # Store the required details in the mapping
-        full_name = player_data["name"] + " " + player_data["lastName"]
-        card_id_to_player_name[card_id] = full_name
+@st.cache_resource
+def load_roles():
+    # Role IDs are contract constants, so one read per process is enough
+    admin_role = player_card_contract.functions.ADMIN_ROLE().call()
+    registrar_role = player_registration_contract.functions.REGISTRAR_ROLE().call()
+    return admin_role, registrar_role
 
-    return card_id_to_player_name
-
-# Update the mapping when the app starts
-fetch_player_data_for_all_cards()
+w3 = get_web3()
+player_registration_contract, player_card_contract = load_contracts()
+ADMIN_ROLE, REGISTRAR_ROLE = load_roles()
+
+@st.cache_resource
+def start_metrics_server():
+    # Optional Prometheus scrape endpoint, one per process
+    port = os.getenv("METRICS_PORT")
+    return metrics.start_http_server(int(port)) if port else None
+
+start_metrics_server()
+
+# ===================== Chain Index =====================
+@st.cache_resource
+def get_chain_index():
+    """
+    Local event index plus the in-memory card index, card leaderboards and
+    points history, created once per process. The in-memory structures are
+    seeded from what is already indexed before a background thread follows
+    new blocks, so reruns never wait on a sync and no event is missed.
+    """
+    chain_indexer = ChainIndexer(
+        w3,
+        player_registration_contract,
+        player_card_contract,
+        os.getenv("INDEX_DB_PATH", "../.cache/chain_index.sqlite3"),
+        start_block=int(os.getenv("INDEXER_START_BLOCK", "0")),
+        chunk_size=int(os.getenv("INDEXER_CHUNK_SIZE", "2000"))
+    )
+    cards = chain_indexer.all_cards()
+    card_index = CardIndex()
+    card_index.load(cards)
+    card_leaderboards = Leaderboards()
+    card_leaderboards.load_cards(cards)
+    points_history = PointsHistory()
+    points_history.load(chain_indexer.points_history())
+    for listener in (card_index, card_leaderboards, points_history):
+        chain_indexer.add_listener(listener.on_chain_event)
+
+    threading.Thread(
+        target=chain_indexer.follow,
+        kwargs={
+            "poll_interval": float(os.getenv("INDEXER_POLL_INTERVAL", "2.0")),
+            "price_refresh_interval": float(os.getenv("INDEXER_PRICE_REFRESH_INTERVAL", "300.0")),
+        },
+        name="chain-indexer",
+        daemon=True
+    ).start()
+    return chain_indexer, card_index, card_leaderboards, points_history
+
+chain_indexer, card_index, card_leaderboards, points_history = get_chain_index()
+
+@st.cache_resource
+def get_player_leaderboards():
+    # Player standings from the scoring output the fantasy points sync uses
+    return Leaderboards()
+
+def refresh_player_leaderboards():
+    # Re-applied only when the file changes, e.g. after match_log.py exports a new match day
+    player_leaderboards = get_player_leaderboards()
+    player_leaderboards.load_points_file(Path(os.getenv("FANTASY_POINTS_PATH", "../metadata/hodlerfc.json")))
+    return player_leaderboards
+
+# ===================== Transaction Manager =====================
+@st.cache_resource
+def get_tx_manager():
+    """Process-wide transaction manager; its receipt poller outlives individual reruns."""
+    return TransactionManager(w3, poll_interval=float(os.getenv("TX_POLL_INTERVAL", "1.0")))
+
+tx_manager = get_tx_manager()
+
+# ===================== Cached Chain Reads =====================
+@st.cache_data(ttl=60)
+def get_accounts():
+    return w3.eth.accounts
+
+@st.cache_data(ttl=60)
+def has_admin_role(account):
+    return player_card_contract.functions.hasRole(ADMIN_ROLE, account).call()
+
+@st.cache_data(ttl=30)
+def get_current_eth_price():
+    return Decimal(player_card_contract.functions.getCurrentPrice().call() / 1e8)
+
+# ===================== Pagination =====================
+def paginate(label, total, key):
+    """Render a page picker when needed and return (limit, offset) for the index query."""
+    pages = max(1, -(-total // PAGE_SIZE))
+    page = st.number_input(f"{label} page (of {pages})", min_value=1, max_value=pages, value=1, key=key) if pages > 1 else 1
+    return PAGE_SIZE, (page - 1) * PAGE_SIZE
 
 # ===================== Player Registration =====================
 def register_player():
@@ -93,24 +192,24 @@ def register_player():
                 st.write("Please upload a selfie.")
                 st.stop()
 
-            selfie_hash = pin_file_to_ipfs(uploaded_file)
             player_data = {
                 "name": player_name,
                 "lastName": player_last_name,
                 "nationality": nationality,
                 "dob": dob.strftime("%Y-%m-%d"),
-                "phone": selected_country_code + phone_number,
-                "selfieHash": selfie_hash
+                "phone": selected_country_code + phone_number
             }
-            player_data_hash = pin_json_to_ipfs(player_data)
+            # The selfie and the metadata naming its CID upload in parallel
+            player_data_hash, player_data = pin_player(uploaded_file, player_data)
             
-            # Gas estimation and transaction
-            gas_estimate = player_registration_contract.functions.registerPlayer(player_data_hash).estimateGas({'from': address, 'gas': 5000000})
-            tx_hash = player_registration_contract.functions.registerPlayer(player_data_hash).transact({'from': address, 'gas': gas_estimate})
-
-            receipt = w3.eth.waitForTransactionReceipt(tx_hash)
-            st.success(f"Successfully registered as a player, welcome {player_name} {player_last_name}!")
-            st.write(dict(receipt))
+            # Gas is estimated once by the manager and the transaction is sent without waiting
+            tx_hash = tx_manager.submit(
+                f"Register {player_name} {player_last_name}",
+                player_registration_contract.functions.registerPlayer(player_data_hash),
+                {'from': address},
+                on_confirmed=lambda receipt: f"Successfully registered as a player, welcome {player_name} {player_last_name}!"
+            )
+            st.info(f"Registration submitted (transaction {tx_hash}). Track it under Transactions in the sidebar.")
         except ValueError as ve:
             st.error(f"Transaction error: {ve}")
         except Exception as e:
@@ -136,22 +235,27 @@ def mint_player_card():
 
     if st.button("Mint Card"):
         try:
-            tx_hash = player_card_contract.functions.mintCard(team, position, league, season, profile_picture, fantasy_points).transact({'from': address, 'value': required_fee_in_eth})
-            receipt = w3.eth.waitForTransactionReceipt(tx_hash)
-            
-            # Calculate ETH spent on gas
-            gas_used = receipt['gasUsed']
-            gas_price = w3.eth.gasPrice
-            eth_spent_on_gas = Web3.fromWei(gas_used * gas_price, 'ether')
-            usd_spent_on_gas = Decimal(eth_spent_on_gas) * current_eth_price
-            
-            # Calculate total ETH and USD spent
-            total_eth_spent = eth_spent_on_gas + Web3.fromWei(required_fee_in_eth, 'ether')
-            total_usd_spent = usd_spent_on_gas + Decimal(Web3.fromWei(required_fee_in_eth, 'ether') * current_eth_price)
+            def minted_message(receipt):
+                # Calculate ETH spent on gas
+                gas_used = receipt['gasUsed']
+                gas_price = receipt.get('effectiveGasPrice', tx_manager.gas_price())
+                eth_spent_on_gas = Web3.fromWei(gas_used * gas_price, 'ether')
+                usd_spent_on_gas = Decimal(eth_spent_on_gas) * current_eth_price
+
+                # Calculate total ETH and USD spent
+                total_eth_spent = eth_spent_on_gas + Web3.fromWei(required_fee_in_eth, 'ether')
+                total_usd_spent = usd_spent_on_gas + Decimal(Web3.fromWei(required_fee_in_eth, 'ether') * current_eth_price)
+
+                return f"Player card minted! Total spent: {total_eth_spent:.6f} ETH. This includes a minting fee of {Web3.fromWei(required_fee_in_eth, 'ether'):.6f} ETH and gas fees of {eth_spent_on_gas:.6f} ETH. Total in USD: $ {total_usd_spent:.2f}."
+
+            tx_hash = tx_manager.submit(
+                f"Mint {position} card ({league} {season})",
+                player_card_contract.functions.mintCard(team, position, league, season, profile_picture, fantasy_points),
+                {'from': address, 'value': required_fee_in_eth},
+                on_confirmed=minted_message
+            )
+            st.info(f"Mint submitted (transaction {tx_hash}). Track it under Transactions in the sidebar.")
 
-            st.success(f"Player card minted! Total spent: {total_eth_spent:.6f} ETH. This includes a minting fee of {Web3.fromWei(required_fee_in_eth, 'ether'):.6f} ETH and gas fees of {eth_spent_on_gas:.6f} ETH. Total in USD: $ {total_usd_spent:.2f}.")
-            st.write(dict(receipt))
-            
         except ValueError as ve:
             st.error(f"Transaction error: {ve}")
         except Exception as e:
@@ -159,26 +263,24 @@ def mint_player_card():
 
 # ===================== Fantasy Points Update =====================
 def update_fantasy_points_on_chain(player_name, league, season, fantasy_points):
-    # Find the card IDs using the mapping
-    card_ids_for_player = [key for key, value in card_id_to_player_name.items() if value == player_name]
-    
-    if not card_ids_for_player:
+    if not card_index.card_ids_for_name(player_name):
         st.error(f"Couldn't find any cards associated with the name {player_name}")
         return
 
-    for card_id in card_ids_for_player:
-        card_data = player_card_contract.functions.cards(card_id).call()
-        
-        if card_data[7] and card_data[3] == league and card_data[4] == season:
-            try:
-                tx_hash = player_card_contract.functions.updateFantasyPoints(card_id, fantasy_points).transact({'from': address})
-                receipt = w3.eth.waitForTransactionReceipt(tx_hash)
-                st.success(f"Fantasy points updated on-chain for card ID {card_id}!")
-                st.write(dict(receipt))
-            except ValueError as ve:
-                st.error(f"Transaction error for card ID {card_id}: {ve}")
-            except Exception as e:
-                st.error(f"An unexpected error occurred for card ID {card_id}: {e}")
+    # Active cards for this league and season, straight from the index
+    for card_id in card_index.active_card_ids(player_name, league, season):
+        try:
+            tx_hash = tx_manager.submit(
+                f"Update fantasy points for card ID {card_id}",
+                player_card_contract.functions.updateFantasyPoints(card_id, fantasy_points),
+                {'from': address},
+                on_confirmed=lambda receipt, card_id=card_id: f"Fantasy points updated on-chain for card ID {card_id}!"
+            )
+            st.info(f"Fantasy points update for card ID {card_id} submitted (transaction {tx_hash}).")
+        except ValueError as ve:
+            st.error(f"Transaction error for card ID {card_id}: {ve}")
+        except Exception as e:
+            st.error(f"An unexpected error occurred for card ID {card_id}: {e}")
 
 def update_fantasy_points():
     st.markdown("## Update Fantasy Points")
@@ -201,7 +303,7 @@ def update_fantasy_points():
         api_gateway_url = os.getenv("API_GATEWAY_URL")
         
         # Send an HTTP GET request to the API Gateway
-        api_response = requests.get(api_gateway_url, params=data)
+        api_response = http_client.get(api_gateway_url, params=data)
     
         if api_response.status_code == 200:
             response_data = api_response.json()
@@ -213,67 +315,66 @@ def update_fantasy_points():
         else:
             st.error(f"API error (Status {api_response.status_code}): {api_response.text}")
 
+    st.markdown("### Sync Whole Season")
+    st.write("Push every changed card for the selected league and season in batched transactions.")
+
+    if st.button("Sync Season Fantasy Points"):
+        try:
+            api_gateway_url = os.getenv("API_GATEWAY_URL")
+            if api_gateway_url:
+                points_table = fetch_season_points(api_gateway_url, league, season)
+            else:
+                points_table = load_points_table(Path(os.getenv("FANTASY_POINTS_PATH", "../metadata/hodlerfc.json")))
+            summary = sync_season_points(w3, tx_manager, player_card_contract, address, chain_indexer.all_cards(), points_table, league, season)
+
+            if not summary["updated_cards"]:
+                st.success("All cards are already up to date.")
+            for card_ids, tx_hash in summary["results"]:
+                if isinstance(tx_hash, Exception):
+                    st.error(f"Transaction error for card IDs {card_ids}: {tx_hash}")
+                else:
+                    st.info(f"Fantasy points update for {len(card_ids)} cards submitted (transaction {tx_hash}). Track it under Transactions in the sidebar.")
+        except ValueError as ve:
+            st.error(f"Transaction error: {ve}")
+        except Exception as e:
+            st.error(f"An unexpected error occurred: {e}")
+
 # ===================== Display All Registered Players =====================
-def get_all_players():
-    player_list = []
-    for player_address in w3.eth.accounts:
-        if player_registration_contract.functions.isPlayerRegistered(player_address).call():
-            player_info = player_registration_contract.functions.playerInfos(player_address).call()
-            player_data_hash = player_info[1]  # Assuming ipfsHash is the second item in the struct
-            player_data = fetch_from_ipfs(player_data_hash)
-            full_name = f"{player_data['name']} {player_data['lastName']}"
-            player_list.append(full_name)
-    return player_list
+def get_all_players(limit=None, offset=0):
+    return [player["full_name"] for player in chain_indexer.registered_players(limit, offset)]
 
 # ===================== Display All Minted Cards =====================
 def get_all_cards():
     card_list = []
-    all_card_ids = player_card_contract.functions.getAllCardIds().call()
-    for card_id in all_card_ids:
-        card_data = player_card_contract.functions.cards(card_id).call()
-        player_address = card_data[0]  # Assuming the playerAddress is the first item in the struct
-        player_info_hash = player_registration_contract.functions.playerInfos(player_address).call()[1]  # ipfsHash is the second item
-        player_info = fetch_from_ipfs(player_info_hash)
-        full_name = f"{player_info['name']} {player_info['lastName']}"
-        card_list.append(f"Card ID: {card_id} | Player Name: {full_name}")
+    for card in chain_indexer.all_cards():
+        card_list.append(f"Card ID: {card['card_id']} | Player Name: {card['full_name']}")
     return card_list
 
 # ===================== Get Cards for a Specific Player =====================
-def get_cards_for_player(player_name=None):
-    card_list = []
-    all_card_ids = player_card_contract.functions.getAllCardIds().call()
-    
-    for card_id in all_card_ids:
-        card_data = player_card_contract.functions.cards(card_id).call()
-        player_address = card_data[0]
-        player_info_hash = player_registration_contract.functions.playerInfos(player_address).call()[1]
-        player_info = fetch_from_ipfs(player_info_hash)
-        full_name = f"{player_info['name']} {player_info['lastName']}"
-        
-        if not player_name or player_name == full_name:
-            card_list.append(f"Card ID: {card_id} | Player Name: {full_name}")
+def get_cards_for_player(player_name=None, limit=None, offset=0):
+    cards = chain_indexer.cards_for_player(player_name, limit, offset) if player_name else chain_indexer.all_cards(limit, offset)
+    return [card["card_id"] for card in cards]
 
-    return card_list
+def format_card(card_id):
+    return f"Card ID: {card_id} | Player Name: {card_index.player_name(card_id)}"
 
-def get_fantasy_points_for_card(card_entry):
-    if card_entry is None:
+def get_fantasy_points_for_card(card_id):
+    if card_id is None:
         return "There is no player card for this player"
 
-    card_id = int(card_entry.split(" | ")[0].split(": ")[1])
-    card_data = player_card_contract.functions.cards(card_id).call()
-    fantasy_points = card_data[6]
+    # Kept current from FantasyPointsUpdated events
+    fantasy_points = card_leaderboards.points(card_id)
+    if fantasy_points is None:
+        latest = points_history.latest(card_id)
+        fantasy_points = latest[1] if latest else player_card_contract.functions.cards(card_id).call()[6]
     return fantasy_points
 
 # ===================== Set Sale Price for Player Card =====================
 def set_sale_price_for_card():
     st.markdown("## Set Sale Price for Your Card")
     
-    # List the cards owned by the currently selected address
-    owned_token_count = player_card_contract.functions.balanceOf(address).call()
-    owned_cards = []
-    for i in range(owned_token_count):
-        token_id = player_card_contract.functions.tokenOfOwnerByIndex(address, i).call()
-        owned_cards.append(f"Card ID: {token_id}")
+    # List the cards owned by the currently selected address, from the owner index
+    owned_cards = [f"Card ID: {token_id}" for token_id in card_index.card_ids_for_owner(address)]
     
     if not owned_cards:
         st.write("You don't own any cards.")
@@ -285,79 +386,210 @@ def set_sale_price_for_card():
     if st.button("Set Sale Price"):
         card_id = int(selected_card.split(": ")[1])
         sale_price_in_wei = Web3.toWei(sale_price_in_eth, 'ether')
-        tx_hash = player_card_contract.functions.setSalePrice(card_id, sale_price_in_wei).transact({'from': address})
-        receipt = w3.eth.waitForTransactionReceipt(tx_hash)
-        st.success(f"Sale price set for card ID {card_id}!")
-        st.write(dict(receipt))
+        def listed_message(receipt):
+            # setSalePrice emits no event, so the marketplace index is updated here
+            chain_indexer.record_sale_price(card_id, sale_price_in_wei)
+            return f"Sale price set for card ID {card_id}!"
+
+        tx_hash = tx_manager.submit(
+            f"Set sale price for card ID {card_id}",
+            player_card_contract.functions.setSalePrice(card_id, sale_price_in_wei),
+            {'from': address},
+            on_confirmed=listed_message
+        )
+        st.info(f"Sale price submitted for card ID {card_id} (transaction {tx_hash}).")
 
 # ===================== Display All Cards for Sale =====================
 def display_cards_for_sale():
     st.markdown("## Cards Currently for Sale")
-    
-    all_card_ids = player_card_contract.functions.getAllCardIds().call()
-    cards_for_sale = []
-
-    for card_id in all_card_ids:
-        card_data = player_card_contract.functions.cards(card_id).call()
-        sale_price = card_data[8]  # Assuming salePrice is the ninth item in the struct
-        if sale_price > 0:
-            sale_price_in_eth = Web3.fromWei(sale_price, 'ether')
-            cards_for_sale.append(f"Card ID: {card_id} | Sale Price: {sale_price_in_eth} ETH")
-    
-    if cards_for_sale:
-        st.selectbox("Select a card to view its sale price", options=cards_for_sale)
-    else:
+
+    # Filters and sort order
+    col1, col2, col3 = st.columns(3)
+    league = col1.selectbox("League", options=["All"] + league_options, key="market_league")
+    season = col2.selectbox("Season", options=["All"] + season_options, key="market_season")
+    position = col3.selectbox("Position", options=["All"] + position_options, key="market_position")
+    col1, col2, col3 = st.columns(3)
+    max_price_in_eth = col1.number_input("Max price (ETH, 0 for any)", min_value=0.0, key="market_max_price")
+    min_points = col2.number_input("Min fantasy points", min_value=0, step=1, key="market_min_points")
+    sort = col3.selectbox("Sort by", options=["Price: low to high", "Price: high to low", "Points: high to low"], key="market_sort")
+
+    filters = {
+        "league": None if league == "All" else league,
+        "season": None if season == "All" else season,
+        "position": None if position == "All" else position,
+        "max_price": Web3.toWei(max_price_in_eth, 'ether') if max_price_in_eth else None,
+        "min_points": min_points or None,
+        "sort": "points" if sort.startswith("Points") else "price",
+        "descending": sort != "Price: low to high",
+    }
+
+    # Cursors of the pages visited so far; changing a filter starts over
+    if st.session_state.get("market_filters") != filters:
+        st.session_state["market_filters"] = filters
+        st.session_state["market_cursors"] = [None]
+    cursors = st.session_state["market_cursors"]
+
+    cards, next_cursor = chain_indexer.listed_cards(cursor=cursors[-1], limit=PAGE_SIZE, **filters)
+    if not cards:
         st.write("No cards are currently for sale.")
+    else:
+        st.table([
+            {
+                "Card ID": card["card_id"],
+                "Player": card["full_name"],
+                "Position": card["position"],
+                "League": card["league"],
+                "Season": card["season"],
+                "Fantasy Points": card["fantasy_points"],
+                "Sale Price (ETH)": str(Web3.fromWei(int(card["sale_price"]), 'ether')),
+            }
+            for card in cards
+        ])
+
+    # Callbacks run before the next rerun, so the new page renders straight away
+    col1, col2 = st.columns(2)
+    if len(cursors) > 1:
+        col1.button("Previous page", key="market_previous", on_click=cursors.pop)
+    if next_cursor:
+        col2.button("Next page", key="market_next", on_click=cursors.append, args=(next_cursor,))
 
 # ===================== Display Current ETH Price in Sidebar =====================
 def display_current_eth_price():
-    current_eth_price = Decimal(player_card_contract.functions.getCurrentPrice().call() / 1e8)
+    current_eth_price = get_current_eth_price()
     st.sidebar.write(f"The current price of ETH is: ${current_eth_price:.2f} USD")
 
+# ===================== Transaction Status in Sidebar =====================
+def display_transactions():
+    st.sidebar.header("Transactions")
+    st.sidebar.write(f"{tx_manager.pending_count()} pending")
+    st.sidebar.button("Refresh")  # Any rerun picks up the poller's latest results
+
+    for tx in tx_manager.statuses()[:10]:
+        line = f"**{tx['label']}**: {tx['status']}"
+        if tx['status'] == "confirmed" and tx['message']:
+            st.sidebar.success(f"{line}. {tx['message']}")
+        elif tx['status'] in ("failed", "dropped"):
+            st.sidebar.error(f"{line} (transaction {tx['tx_hash']}). {tx['message']}")
+        else:
+            st.sidebar.write(line)
+
+# ===================== Debug Panel in Sidebar =====================
+def display_debug_panel(summary):
+    with st.sidebar.expander("Debug: I/O this rerun"):
+        st.write(f"Rerun took {summary['duration_ms']:.0f} ms")
+        if summary["timings"]:
+            st.table([
+                {"Call": name, "Count": timing["count"], "Total (ms)": timing["total_ms"], "Mean (ms)": timing["mean_ms"]}
+                for name, timing in sorted(summary["timings"].items(), key=lambda item: -item[1]["total_ms"])
+            ])
+        if summary["counters"]:
+            st.table([{"Counter": name, "Value": value} for name, value in sorted(summary["counters"].items())])
+
+# ===================== Players and Cards View =====================
+def display_players_and_cards():
+    # Drop-downs for viewing registered players, one page at a time
+    limit, offset = paginate("Players", chain_indexer.count_registered_players(), key="players_page")
+    all_players = get_all_players(limit, offset)
+    selected_player = st.selectbox("List of Registered Players", options=all_players)
+
+    # Drop-downs for viewing minted cards specific to the selected player
+    limit, offset = paginate("Cards", chain_indexer.count_cards_for_player(selected_player) if selected_player else 0, key="cards_page")
+    all_cards_for_player = get_cards_for_player(selected_player, limit, offset) if selected_player else []
+    selected_card = st.selectbox("List of All Minted Player Cards for the Selected Player", options=all_cards_for_player, format_func=format_card)
+
+    # Display fantasy points for the selected card
+    fantasy_points = get_fantasy_points_for_card(selected_card)
+    if isinstance(fantasy_points, int):
+        st.write(f"Fantasy Points for selected card: {fantasy_points}")
+        rank = card_leaderboards.rank(selected_card)
+        if rank:
+            st.write(f"Rank among cards of the same league, season and position: #{rank}")
+        history = points_history.series(selected_card)
+        if len(history) > 1:
+            st.line_chart({"Fantasy Points": dict(history)})
+    else:
+        st.write(fantasy_points)
+
+# ===================== Leaderboards View =====================
+def display_leaderboards():
+    st.markdown("## Leaderboards")
+
+    col1, col2, col3, col4 = st.columns(4)
+    league = col1.selectbox("League", options=league_options, key="board_league")
+    season = col2.selectbox("Season", options=season_options, key="board_season")
+    position = col3.selectbox("Position", options=["All"] + position_options, key="board_position")
+    k = col4.number_input("Show top", min_value=1, max_value=100, value=10, key="board_k")
+    position = None if position == "All" else position
+
+    st.markdown("### Cards")
+    top_cards = card_leaderboards.top(league, season, position, k)
+    if top_cards:
+        st.table([
+            {"Rank": rank, "Card ID": card_id, "Player": card_index.player_name(card_id), "Fantasy Points": points}
+            for rank, (card_id, points) in enumerate(top_cards, start=1)
+        ])
+    else:
+        st.write("No cards for this league and season yet.")
+
+    st.markdown("### Players")
+    top_players = refresh_player_leaderboards().top(league, season, scoring_positions.get(position, position), k)
+    if top_players:
+        st.table([
+            {"Rank": rank, "Player": entry_id[0], "Team": entry_id[1], "Position": entry_id[4], "Fantasy Points": points}
+            for rank, (entry_id, points) in enumerate(top_players, start=1)
+        ])
+    else:
+        st.write("No scored matches for this league and season yet.")
+
 # ===================== Main Streamlit App =====================
-st.title("Fantasy Soccer Player Registration")
-
-# Sidebar
-st.sidebar.header("Account")
-address = st.sidebar.selectbox("Select Account", options=w3.eth.accounts)
-
-is_registered = player_registration_contract.functions.isPlayerRegistered(address).call()
-REGISTRAR_ROLE = player_registration_contract.functions.REGISTRAR_ROLE().call()
-is_waitlisted = player_registration_contract.functions.playerInfos(address).call()[3]
-
-# If the user has registered, display their name in the sidebar
-if is_registered:
-    player_data_hash = player_registration_contract.functions.playerInfos(address).call()[1]
-    player_data = fetch_from_ipfs(player_data_hash)
-    full_name = f"{player_data['name']} {player_data['lastName']}"
-    st.sidebar.header(f"Welcome, {full_name}")
-
-# Display the current ETH price and expected minting fee in the sidebar
-display_current_eth_price()
-
-# Drop-downs for viewing registered players
-all_players = get_all_players()
-selected_player = st.selectbox("List of Registered Players", options=all_players)
-
-# Drop-downs for viewing minted cards specific to the selected player
-all_cards_for_player = get_cards_for_player(selected_player)
-selected_card = st.selectbox("List of All Minted Player Cards for the Selected Player", options=all_cards_for_player)
-
-# Display fantasy points for the selected card
-fantasy_points = get_fantasy_points_for_card(selected_card)
-if isinstance(fantasy_points, int):
-    st.write(f"Fantasy Points for selected card: {fantasy_points}")
-else:
-    st.write(fantasy_points)
-
-# Check if the connected address has the ADMIN_ROLE in the player_card_contract
-if player_card_contract.functions.hasRole(ADMIN_ROLE, address).call():
-    update_fantasy_points()
-
-if is_registered:
-    mint_player_card()
-    set_sale_price_for_card()
-    display_cards_for_sale()
-elif is_waitlisted:
-    register_player()
-    st.success(f"Your player number is: {player_registration_contract.functions.playerInfos(address).call()[0]}")
\ No newline at end of file
+# The rerun's metrics are reported however it ends: st.stop(), a widget
+# callback's rerun or an error
+try:
+    st.title("Fantasy Soccer Player Registration")
+
+    # Sidebar
+    st.sidebar.header("Account")
+    address = st.sidebar.selectbox("Select Account", options=get_accounts())
+
+    # One read covers the number, IPFS hash, registration and waitlist flags
+    player_info = player_registration_contract.functions.playerInfos(address).call()
+    is_registered = player_info[2]
+    is_waitlisted = player_info[3]
+
+    # If the user has registered, display their name in the sidebar
+    if is_registered:
+        player_data = fetch_from_ipfs(player_info[1])
+        full_name = f"{player_data['name']} {player_data['lastName']}"
+        st.sidebar.header(f"Welcome, {full_name}")
+
+    # Display the current ETH price and expected minting fee in the sidebar
+    display_current_eth_price()
+    display_transactions()
+
+    # Only the selected view's data is loaded on each rerun
+    views = ["Players & Cards", "Leaderboards"]
+    if has_admin_role(address):
+        views.append("Update Fantasy Points")
+    if is_registered:
+        views += ["Mint a Card", "Sell a Card", "Cards for Sale"]
+    elif is_waitlisted:
+        views.append("Register")
+    view = st.sidebar.radio("View", options=views)
+
+    if view == "Players & Cards":
+        display_players_and_cards()
+    elif view == "Leaderboards":
+        display_leaderboards()
+    elif view == "Update Fantasy Points":
+        update_fantasy_points()
+    elif view == "Mint a Card":
+        mint_player_card()
+    elif view == "Sell a Card":
+        set_sale_price_for_card()
+    elif view == "Cards for Sale":
+        display_cards_for_sale()
+    elif view == "Register":
+        register_player()
+        st.success(f"Your player number is: {player_info[0]}")
+finally:
+    display_debug_panel(rerun_metrics.finish())
@@ -0,0 +1,95 @@
+import threading
+from collections import defaultdict
+
+# ===================== In-Memory Card Index =====================
+class CardIndex:
+    """
+    Inverted indexes over minted cards, kept current one event at a time.
+
+    - name -> card IDs
+    - (name, league, season) -> active card IDs
+    - owner -> card IDs
+
+    Every lookup is a single dict access regardless of how many cards exist.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cards = {}
+        self._by_name = defaultdict(set)
+        self._by_name_league_season = defaultdict(set)
+        self._by_owner = defaultdict(set)
+
+    def __len__(self):
+        return len(self._cards)
+
+    def load(self, cards):
+        """Seed the index from already-indexed card rows (see ChainIndexer.all_cards)."""
+        for card in cards:
+            self.add_card(card["card_id"], card["full_name"], card["league"], card["season"],
+                          owner=card["owner"], is_active=bool(card["is_active"]))
+
+    def add_card(self, card_id, full_name, league, season, owner=None, is_active=True):
+        with self._lock:
+            if card_id in self._cards:
+                self._remove(card_id)
+            self._cards[card_id] = {
+                "full_name": full_name,
+                "league": league,
+                "season": season,
+                "owner": owner,
+                "is_active": is_active,
+            }
+            self._by_name[full_name].add(card_id)
+            if is_active:
+                self._by_name_league_season[(full_name, league, season)].add(card_id)
+            if owner is not None:
+                self._by_owner[owner].add(card_id)
+
+    def transfer(self, card_id, new_owner):
+        with self._lock:
+            card = self._cards.get(card_id)
+            if card is None:
+                return
+            if card["owner"] is not None:
+                self._discard(self._by_owner, card["owner"], card_id)
+            card["owner"] = new_owner
+            self._by_owner[new_owner].add(card_id)
+
+    def on_chain_event(self, event, card):
+        """ChainIndexer listener: apply a card event using the freshly indexed card row."""
+        if event["event"] in ("CardMinted", "PlayerNameResolved"):
+            self.add_card(card["card_id"], card["full_name"], card["league"], card["season"],
+                          owner=card["owner"], is_active=bool(card["is_active"]))
+        elif event["event"] == "Transfer":
+            self.transfer(card["card_id"], card["owner"])
+
+    # ---------- Lookups ----------
+    def card_ids_for_name(self, full_name):
+        return sorted(self._by_name.get(full_name, ()))
+
+    def active_card_ids(self, full_name, league, season):
+        return sorted(self._by_name_league_season.get((full_name, league, season), ()))
+
+    def card_ids_for_owner(self, owner):
+        return sorted(self._by_owner.get(owner, ()))
+
+    def player_name(self, card_id):
+        card = self._cards.get(card_id)
+        return card["full_name"] if card else None
+
+    # ---------- Internal ----------
+    @staticmethod
+    def _discard(index, key, card_id):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(card_id)
+            if not ids:
+                del index[key]
+
+    def _remove(self, card_id):
+        card = self._cards.pop(card_id)
+        self._discard(self._by_name, card["full_name"], card_id)
+        self._discard(self._by_name_league_season, (card["full_name"], card["league"], card["season"]), card_id)
+        if card["owner"] is not None:
+            self._discard(self._by_owner, card["owner"], card_id)
@@ -0,0 +1,113 @@
+import json
+import argparse
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pathlib import Path
+
+from scoring import load_match_stats
+
+# ===================== Columnar Storage =====================
+# Match stats and aggregated points are stored as Parquet (compressed, with
+# column and row-group pruning) or as uncompressed Arrow IPC files, which are
+# memory-mapped so reading selected columns doesn't copy any buffers. The
+# format is picked from the file suffix: .parquet or .arrow/.feather.
+#
+# Filters are {column: value} or {column: [values]} and are pushed down to
+# the Parquet reader so unneeded row groups are never decoded.
+
+IPC_SUFFIXES = (".arrow", ".feather")
+POINTS_COLUMNS = ["Player Full Name", "Fantasy Points", "League", "Season", "Team", "Position"]
+
+
+def _filter_expression(filters):
+    expression = None
+    for column, value in (filters or {}).items():
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        term = pc.field(column).isin(list(values))
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def write_table(table, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix in IPC_SUFFIXES:
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        pq.write_table(table, path)
+
+
+def read_table(path, columns=None, filters=None):
+    """Read only the requested columns and rows of a Parquet or Arrow IPC file."""
+    path = Path(path)
+    expression = _filter_expression(filters)
+
+    if path.suffix in IPC_SUFFIXES:
+        source = pa.memory_map(str(path), "r")
+        table = pa.ipc.open_file(source).read_all()
+        if expression is not None:
+            table = table.filter(expression)
+        return table.select(columns) if columns else table
+
+    return pq.read_table(path, columns=columns, filters=expression, memory_map=True)
+
+
+# ===================== Match Stats =====================
+def excel_to_match_table(excel_path, sheet_name="Fantasy"):
+    """Ingest adapter: the only place the xlsx sheet is parsed."""
+    df = load_match_stats(excel_path, sheet_name).reset_index()
+    # Red Card mixes 0 and labels after fillna; keep it a string column.
+    df["Red Card"] = df["Red Card"].astype(str)
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def read_match_stats(path, columns=None, filters=None):
+    """Load match stats as a DataFrame indexed by player, like scoring.load_match_stats."""
+    if columns and "Player Full Name" not in columns:
+        columns = ["Player Full Name"] + list(columns)
+    df = read_table(path, columns, filters).to_pandas()
+    return df.set_index("Player Full Name")
+
+
+# ===================== Aggregated Points =====================
+def points_json_to_table(json_data):
+    """Flatten hodlerfc.json's {player: [entries]} into one row per entry."""
+    rows = [
+        {"Player Full Name": player_name, **entry}
+        for player_name, entries in json_data.items()
+        for entry in entries
+    ]
+    return pa.Table.from_pylist(rows).select(POINTS_COLUMNS)
+
+
+def points_table_to_json(table):
+    """Inverse of points_json_to_table, for consumers that still expect hodlerfc.json."""
+    json_data = {}
+    for row in table.to_pylist():
+        player_name = row.pop("Player Full Name")
+        json_data.setdefault(player_name, []).append(row)
+    return json_data
+
+
+def read_points(path, columns=None, filters=None):
+    return read_table(path, columns, filters)
+
+
+# ===================== Command Line =====================
+def main():
+    parser = argparse.ArgumentParser(description="Convert the xlsx/JSON pipeline files to columnar formats.")
+    parser.add_argument("--excel", type=Path, default=Path("../resources/HMFC_2023-1.xlsx"))
+    parser.add_argument("--points-json", type=Path, default=Path("../metadata/hodlerfc.json"))
+    parser.add_argument("--matches-out", type=Path, default=Path("../metadata/hodlerfc_matches.parquet"))
+    parser.add_argument("--points-out", type=Path, default=Path("../metadata/hodlerfc_points.arrow"))
+    args = parser.parse_args()
+
+    write_table(excel_to_match_table(args.excel), args.matches_out)
+    with open(args.points_json) as f:
+        write_table(points_json_to_table(json.load(f)), args.points_out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import os
+import uuid
+import threading
+import contextvars
+import requests
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_TIMEOUT_SECONDS", "15"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "32"))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+MAX_CONCURRENCY = int(os.getenv("HTTP_MAX_CONCURRENCY", "16"))
+
+# ===================== Pooled Sessions =====================
+# One keep-alive Session per host. Retries use exponential backoff on
+# connection errors and on 429/5xx responses; POSTs are only retried when the
+# connection failed before the request was sent, so a transaction is never
+# submitted twice.
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _host_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _record_response(response, *args, **kwargs):
+    # Per-host latency and bytes for every request on a pooled session
+    host = urlsplit(response.url).netloc
+    body = response.request.body
+    metrics.observe("http_request_seconds", response.elapsed.total_seconds(), host=host)
+    metrics.add("http_requests_total", host=host, status=str(response.status_code))
+    metrics.add("http_request_bytes_total", len(body) if body else 0, host=host)
+    metrics.add("http_response_bytes_total", len(response.content), host=host)
+
+
+def get_session(url):
+    """Return the shared Session for the host of `url`."""
+    key = _host_key(url)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            retry = Retry(
+                total=MAX_RETRIES,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+            session = requests.Session()
+            session.mount(key, adapter)
+            session.hooks["response"].append(_record_response)
+            _sessions[key] = session
+        return session
+
+
+def request(method, url, timeout=DEFAULT_TIMEOUT, **kwargs):
+    return get_session(url).request(method, url, timeout=timeout, **kwargs)
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+# ===================== Streaming Multipart =====================
+class MultipartStream:
+    """
+    A multipart/form-data body with a single file field, read lazily.
+
+    Pass it as `data=` with `content_type` as the Content-Type header: requests
+    sends it with a Content-Length and reads the file in small blocks, so
+    memory use does not grow with the file size.
+    """
+
+    def __init__(self, field, filename, fileobj, content_type="application/octet-stream"):
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        head = (
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'
+        ).encode("utf-8")
+        tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+
+        start = fileobj.tell()
+        fileobj.seek(0, os.SEEK_END)
+        self._length = len(head) + fileobj.tell() - start + len(tail)
+        fileobj.seek(start)
+        self._parts = [_BytesReader(head), fileobj, _BytesReader(tail)]
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        out = b""
+        while self._parts and (size < 0 or len(out) < size):
+            block = self._parts[0].read(-1 if size < 0 else size - len(out))
+            if not block:
+                self._parts.pop(0)
+            out += block
+        return out
+
+
+class _BytesReader:
+    def __init__(self, data):
+        self._data = data
+        self._offset = 0
+
+    def read(self, size=-1):
+        end = len(self._data) if size < 0 else self._offset + size
+        block = self._data[self._offset:end]
+        self._offset += len(block)
+        return block
+
+
+# ===================== Concurrent Fan-out =====================
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="http-fanout")
+
+
+def fetch_many(fn, items):
+    """
+    Apply fn to every item concurrently (at most HTTP_MAX_CONCURRENCY at a
+    time) and return the results in input order. Exceptions propagate.
+    """
+    items = list(items)
+    # Nested fan-out from a pool thread could starve the pool; run those inline.
+    if len(items) <= 1 or threading.current_thread().name.startswith("http-fanout"):
+        return [fn(item) for item in items]
+    # Each task runs in a copy of the caller's context so its metrics land in the caller's Scope
+    futures = [_executor.submit(contextvars.copy_context().run, fn, item) for item in items]
+    return [future.result() for future in futures]
@@ -0,0 +1,564 @@
+import os
+import time
+import sqlite3
+import threading
+from web3 import Web3
+from eth_utils.abi import collapse_if_tuple
+
+import http_client
+from pinata import fetch_from_ipfs
+from rpc_batch import fetch_cards, fetch_cards_at, fetch_player_infos
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+CARD_EVENTS = ["CardMinted", "CardPurchased", "FantasyPointsUpdated", "Transfer"]
+PLAYER_EVENTS = ["PlayerRegistered", "PlayerWaitlisted", "PlayerDeregistered", "PlayerRemovedFromWaitlist"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoint (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    last_block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    address TEXT PRIMARY KEY,
+    player_number INTEGER,
+    ipfs_hash TEXT,
+    full_name TEXT,
+    is_registered INTEGER NOT NULL DEFAULT 0,
+    is_waitlisted INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS cards (
+    card_id INTEGER PRIMARY KEY,
+    player_address TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    team TEXT,
+    position TEXT,
+    league TEXT,
+    season TEXT,
+    profile_picture TEXT,
+    fantasy_points INTEGER NOT NULL DEFAULT 0,
+    is_active INTEGER NOT NULL DEFAULT 1,
+    sale_price TEXT NOT NULL DEFAULT '0',
+    minted_block INTEGER
+);
+CREATE TABLE IF NOT EXISTS listings (
+    card_id INTEGER PRIMARY KEY,
+    price_key TEXT NOT NULL,
+    league TEXT,
+    season TEXT,
+    position TEXT,
+    fantasy_points INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS points_history (
+    card_id INTEGER NOT NULL,
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    fantasy_points INTEGER NOT NULL,
+    PRIMARY KEY (card_id, block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS cards_player_address ON cards (player_address);
+CREATE INDEX IF NOT EXISTS cards_owner ON cards (owner);
+CREATE INDEX IF NOT EXISTS players_full_name ON players (full_name);
+CREATE INDEX IF NOT EXISTS listings_price ON listings (price_key, card_id);
+CREATE INDEX IF NOT EXISTS listings_points ON listings (fantasy_points, card_id);
+CREATE INDEX IF NOT EXISTS listings_league_season_price ON listings (league, season, price_key, card_id);
+"""
+
+# Sale prices are uint256 wei, too large for SQLite integers. Zero-padding them
+# to the 78 digits of 2**256 makes text order match numeric order.
+PRICE_KEY_DIGITS = 78
+LISTING_SORTS = {"price": "listings.price_key", "points": "listings.fantasy_points"}
+
+
+def _price_key(wei):
+    return str(int(wei)).zfill(PRICE_KEY_DIGITS)
+
+
+def _player_name(player_data, address):
+    """
+    Display name from registration metadata. None when the metadata could not
+    be fetched, so the player is retried later; registerPlayer accepts any
+    string, so metadata without name fields falls back to the address.
+    """
+    if not player_data:
+        return None
+    if not isinstance(player_data, dict):
+        return address
+    parts = [str(player_data[field]) for field in ("name", "lastName") if player_data.get(field)]
+    return " ".join(parts) or address
+
+# ===================== Event Topics =====================
+def _event_signature(event_abi):
+    types = ",".join(collapse_if_tuple(arg) for arg in event_abi["inputs"])
+    return f"{event_abi['name']}({types})"
+
+
+def _topic_map(contract, event_names):
+    """Map topic0 -> bound event object so raw logs can be decoded in one pass."""
+    topics = {}
+    for entry in contract.abi:
+        if entry.get("type") == "event" and entry["name"] in event_names:
+            topic = Web3.keccak(text=_event_signature(entry)).hex()
+            topics[topic] = getattr(contract.events, entry["name"])()
+    return topics
+
+
+# ===================== Chain Indexer =====================
+class ChainIndexer:
+    """
+    Local SQLite index of cards and players built from contract events.
+
+    `sync()` backfills from the last checkpoint with chunked eth_getLogs and
+    can be called on every Streamlit rerun: once caught up it costs a single
+    eth_blockNumber. `follow()` does the same in a loop for a background
+    worker.
+
+    setSalePrice() does not emit an event, so sale prices are recorded by the
+    caller with `record_sale_price()` once its transaction confirms, and
+    `follow()` reconciles them from chain with `refresh_sale_prices()` once
+    caught up and then every `price_refresh_interval` seconds, which picks up
+    listings made from other processes; purchases reset them from
+    CardPurchased. Listed cards are mirrored into a `listings` table
+    indexed by price and points so `listed_cards()` pages through the market
+    without touching unlisted cards.
+
+    Players whose metadata could not be fetched are indexed without a name
+    and retried every `name_retry_interval` seconds from `sync()`. Once a
+    name resolves, listeners get a synthetic "PlayerNameResolved" event for
+    each of that player's cards.
+
+    Listeners registered with `add_listener(fn)` are called as fn(event, card)
+    for each card event once its chunk has committed, with the card's updated
+    index row. A failing listener is reported and skipped; it never rolls
+    back or stalls the index.
+    """
+
+    def __init__(self, w3, player_registration_contract, player_card_contract, db_path,
+                 start_block=0, chunk_size=2000, confirmations=0, fetch_metadata=fetch_from_ipfs,
+                 name_retry_interval=60.0):
+        self.w3 = w3
+        self.player_registration_contract = player_registration_contract
+        self.player_card_contract = player_card_contract
+        self.start_block = start_block
+        self.chunk_size = chunk_size
+        self.confirmations = confirmations
+        self.fetch_metadata = fetch_metadata
+        self.name_retry_interval = name_retry_interval
+        self._next_name_retry = 0.0
+        self._listeners = []
+
+        self._topics = {}
+        self._topics.update(_topic_map(player_card_contract, CARD_EVENTS))
+        self._topics.update(_topic_map(player_registration_contract, PLAYER_EVENTS))
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # _lock guards the connection; _sync_lock keeps one syncer at a time
+        # while letting readers in between chunks.
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(SCHEMA)
+        self._backfill_listings()
+        self._backfill_points_history()
+        self._db.commit()
+
+    # ---------- Checkpoint ----------
+    @property
+    def last_block(self):
+        with self._lock:
+            row = self._db.execute("SELECT last_block FROM checkpoint WHERE id = 0").fetchone()
+        return row["last_block"] if row else self.start_block - 1
+
+    def _set_checkpoint(self, block_number):
+        self._db.execute(
+            "INSERT INTO checkpoint (id, last_block) VALUES (0, ?) "
+            "ON CONFLICT (id) DO UPDATE SET last_block = excluded.last_block",
+            (block_number,)
+        )
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    # ---------- Sync ----------
+    def sync(self):
+        """Index every new block up to the chain head. Returns the number of events applied."""
+        with self._sync_lock:
+            head = self.w3.eth.blockNumber - self.confirmations
+            applied = 0
+            from_block = self.last_block + 1
+
+            while from_block <= head:
+                to_block = min(from_block + self.chunk_size - 1, head)
+                logs = self.w3.eth.getLogs({
+                    "address": [self.player_card_contract.address, self.player_registration_contract.address],
+                    "fromBlock": from_block,
+                    "toBlock": to_block,
+                })
+                # Network reads happen outside the connection lock so queries aren't blocked.
+                events, context = self._prepare_logs(logs)
+
+                with self._lock:
+                    try:
+                        notifications = self._apply_events(events, context)
+                        # Events and checkpoint commit together so a crash never skips a chunk.
+                        self._set_checkpoint(to_block)
+                        self._db.commit()
+                    except Exception:
+                        # Leave nothing half-applied for another thread's commit to write out
+                        self._db.rollback()
+                        raise
+                self._notify(notifications)
+                applied += len(events)
+                from_block = to_block + 1
+
+            self._resolve_missing_names()
+            return applied
+
+    def follow(self, poll_interval=2.0, stop_event=None, price_refresh_interval=300.0):
+        """Keep the index (and its sale prices) at the chain head until stop_event is set."""
+        stop_event = stop_event or threading.Event()
+        next_price_refresh = 0.0
+        while not stop_event.is_set():
+            try:
+                self.sync()
+                if time.monotonic() >= next_price_refresh:
+                    self.refresh_sale_prices()
+                    next_price_refresh = time.monotonic() + price_refresh_interval
+            except Exception as err:
+                print(f"Error syncing chain index: {err}")
+            stop_event.wait(poll_interval)
+
+    def _prepare_logs(self, logs):
+        events = []
+        for log in sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"])):
+            topic = log["topics"][0].hex() if log["topics"] else None
+            if topic in self._topics:
+                events.append(self._topics[topic].processLog(log))
+
+        # Everything an event doesn't carry is read in bulk up front.
+        minted_ids = [event["args"]["cardId"] for event in events if event["event"] == "CardMinted"]
+        registered = [event["args"]["playerAddress"] for event in events if event["event"] == "PlayerRegistered"]
+        ipfs_hashes = list(dict.fromkeys(event["args"]["ipfsHash"] for event in events if event["event"] == "PlayerRegistered"))
+        minted_cards = fetch_cards(self.w3, self.player_card_contract, minted_ids)
+        minted_points = self._points_at_mint(events, minted_cards)
+        player_infos = fetch_player_infos(self.w3, self.player_registration_contract, registered)
+        metadata = dict(zip(ipfs_hashes, http_client.fetch_many(self.fetch_metadata, ipfs_hashes)))
+        return events, {"minted_cards": minted_cards, "minted_points": minted_points,
+                        "player_infos": player_infos, "metadata": metadata}
+
+    def _points_at_mint(self, events, minted_cards):
+        """
+        Each minted card's points as of its mint block. The head read in
+        minted_cards already includes later FantasyPointsUpdated events, which
+        a backfill applies afterwards. Nodes without the historical state fall
+        back to the head value.
+        """
+        card_blocks = [(event["args"]["cardId"], event["blockNumber"]) for event in events if event["event"] == "CardMinted"]
+        try:
+            cards_at_mint = fetch_cards_at(self.w3, self.player_card_contract, card_blocks)
+        except ValueError as err:
+            print(f"Error reading cards at their mint blocks, using current points: {err}")
+            cards_at_mint = minted_cards
+        return {card_id: card_data[6] for card_id, card_data in cards_at_mint.items()}
+
+    def _apply_events(self, events, context):
+        """Apply events to the open transaction; returns the (event, card row) pairs listeners are owed."""
+        notifications = []
+        for event in events:
+            handler = getattr(self, f"_on_{event['event']}")
+            handler(event, **context)
+            if self._listeners and event["event"] in CARD_EVENTS:
+                card = self._card_row(event["args"].get("cardId", event["args"].get("tokenId")))
+                if card is not None:
+                    notifications.append((event, card))
+        return notifications
+
+    def _notify(self, notifications):
+        for event, card in notifications:
+            for listener in self._listeners:
+                try:
+                    listener(event, card)
+                except Exception as err:
+                    print(f"Error in chain index listener for {event['event']} (card {card['card_id']}): {err}")
+
+    # ---------- Card Events ----------
+    def _on_CardMinted(self, event, minted_cards, minted_points, **_):
+        card_id = event["args"]["cardId"]
+        card_data = minted_cards[card_id]
+        fantasy_points = minted_points[card_id]
+        self._db.execute(
+            "INSERT OR REPLACE INTO cards (card_id, player_address, owner, team, position, league, season, "
+            "profile_picture, fantasy_points, is_active, sale_price, minted_block) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (card_id, card_data[0], event["args"]["player"], card_data[1], card_data[2], card_data[3],
+             card_data[4], card_data[5], fantasy_points, int(card_data[7]), '0', event["blockNumber"])
+        )
+        # mintCard always starts unlisted. The head read's salePrice may come from a later
+        # setSalePrice, so listings are left to record_sale_price and refresh_sale_prices.
+        self._set_sale_price(card_id, 0)
+        self._record_points(card_id, event, fantasy_points)
+
+    def _on_Transfer(self, event, **_):
+        if event["args"]["from"] == ZERO_ADDRESS:
+            return  # Mints are handled by CardMinted
+        self._db.execute(
+            "UPDATE cards SET owner = ? WHERE card_id = ?",
+            (event["args"]["to"], event["args"]["tokenId"])
+        )
+
+    def _on_CardPurchased(self, event, **_):
+        # buyCard resets the sale price right after emitting this event.
+        self._set_sale_price(event["args"]["cardId"], 0)
+
+    def _on_FantasyPointsUpdated(self, event, **_):
+        for table in ("cards", "listings"):
+            self._db.execute(
+                f"UPDATE {table} SET fantasy_points = ? WHERE card_id = ?",
+                (event["args"]["newFantasyPoints"], event["args"]["cardId"])
+            )
+        self._record_points(event["args"]["cardId"], event, event["args"]["newFantasyPoints"])
+
+    # ---------- Points History ----------
+    def _record_points(self, card_id, event, points):
+        self._db.execute(
+            "INSERT OR REPLACE INTO points_history (card_id, block_number, log_index, fantasy_points) VALUES (?, ?, ?, ?)",
+            (card_id, event["blockNumber"], event["logIndex"], points)
+        )
+
+    def _backfill_points_history(self):
+        # Indexes built before points_history existed start each card's series at its current points.
+        self._db.execute(
+            "INSERT INTO points_history (card_id, block_number, log_index, fantasy_points) "
+            "SELECT card_id, COALESCE(minted_block, 0), -1, fantasy_points FROM cards "
+            "WHERE card_id NOT IN (SELECT DISTINCT card_id FROM points_history)"
+        )
+
+    # ---------- Player Events ----------
+    def _upsert_player(self, address, **fields):
+        self._db.execute("INSERT OR IGNORE INTO players (address) VALUES (?)", (address,))
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        self._db.execute(f"UPDATE players SET {assignments} WHERE address = ?", (*fields.values(), address))
+
+    def _on_PlayerRegistered(self, event, player_infos, metadata, **_):
+        address = event["args"]["playerAddress"]
+        ipfs_hash = event["args"]["ipfsHash"]
+        self._upsert_player(
+            address,
+            player_number=player_infos[address][0],
+            ipfs_hash=ipfs_hash,
+            full_name=_player_name(metadata[ipfs_hash], address),
+            is_registered=1,
+            is_waitlisted=0
+        )
+
+    def _resolve_missing_names(self):
+        """Retry the metadata of players whose IPFS fetch failed when they were indexed."""
+        now = time.monotonic()
+        if now < self._next_name_retry:
+            return
+        self._next_name_retry = now + self.name_retry_interval
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT address, ipfs_hash FROM players WHERE full_name IS NULL AND ipfs_hash IS NOT NULL"
+            ).fetchall()
+        if not rows:
+            return
+        ipfs_hashes = list(dict.fromkeys(row["ipfs_hash"] for row in rows))
+        metadata = dict(zip(ipfs_hashes, http_client.fetch_many(self.fetch_metadata, ipfs_hashes)))
+
+        with self._lock:
+            resolved = []
+            try:
+                for row in rows:
+                    full_name = _player_name(metadata[row["ipfs_hash"]], row["address"])
+                    if full_name is not None:
+                        self._upsert_player(row["address"], full_name=full_name)
+                        resolved.append(row["address"])
+                self._db.commit()
+            except Exception:
+                self._db.rollback()
+                raise
+
+            # Cards indexed under the missing name move to the resolved one
+            notifications = []
+            for address in resolved if self._listeners else ():
+                event = {"event": "PlayerNameResolved", "args": {"playerAddress": address}}
+                card_ids = [row["card_id"] for row in self._db.execute(
+                    "SELECT card_id FROM cards WHERE player_address = ?", (address,)
+                )]
+                notifications += [(event, self._card_row(card_id)) for card_id in card_ids]
+        self._notify(notifications)
+
+    def _on_PlayerWaitlisted(self, event, **_):
+        self._upsert_player(event["args"]["playerAddress"], is_waitlisted=1)
+
+    def _on_PlayerRemovedFromWaitlist(self, event, **_):
+        self._upsert_player(event["args"]["playerAddress"], is_waitlisted=0)
+
+    def _on_PlayerDeregistered(self, event, **_):
+        self._upsert_player(event["args"]["playerAddress"], is_registered=0)
+
+    # ---------- Sale Prices ----------
+    def _set_sale_price(self, card_id, price):
+        self._db.execute("UPDATE cards SET sale_price = ? WHERE card_id = ?", (str(price), card_id))
+        if price:
+            self._db.execute(
+                "INSERT OR REPLACE INTO listings (card_id, price_key, league, season, position, fantasy_points) "
+                "SELECT card_id, ?, league, season, position, fantasy_points FROM cards WHERE card_id = ?",
+                (_price_key(price), card_id)
+            )
+        else:
+            self._db.execute("DELETE FROM listings WHERE card_id = ?", (card_id,))
+
+    def _backfill_listings(self):
+        # Indexes built before the listings table existed only have cards.sale_price.
+        rows = self._db.execute(
+            "SELECT card_id, sale_price FROM cards WHERE sale_price != '0' "
+            "AND card_id NOT IN (SELECT card_id FROM listings)"
+        ).fetchall()
+        for row in rows:
+            self._set_sale_price(row["card_id"], int(row["sale_price"]))
+
+    def record_sale_price(self, card_id, price):
+        """Record a confirmed setSalePrice(card_id, price); a price of 0 delists the card."""
+        with self._lock:
+            self._set_sale_price(card_id, price)
+            self._db.commit()
+
+    def refresh_sale_prices(self):
+        """
+        Re-read every indexed card's salePrice in one batched pass. Cards whose
+        price changed in the index while the read was in flight (a confirmed
+        record_sale_price, a purchase) keep the newer value.
+        """
+        with self._lock:
+            before = {row["card_id"]: row["sale_price"] for row in self._db.execute("SELECT card_id, sale_price FROM cards")}
+        cards = fetch_cards(self.w3, self.player_card_contract, list(before))
+        with self._lock:
+            current = {row["card_id"]: row["sale_price"] for row in self._db.execute("SELECT card_id, sale_price FROM cards")}
+            for card_id, card_data in cards.items():
+                if current.get(card_id) == before[card_id] != str(card_data[8]):
+                    self._set_sale_price(card_id, card_data[8])
+            self._db.commit()
+
+    # ---------- Queries ----------
+    def _card_row(self, card_id):
+        row = self._db.execute(
+            "SELECT cards.*, players.full_name FROM cards "
+            "LEFT JOIN players ON players.address = cards.player_address WHERE card_id = ?",
+            (card_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def _query(self, sql, params=(), limit=None, offset=0):
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params = (*params, -1 if limit is None else limit, offset)
+        with self._lock:
+            return [dict(row) for row in self._db.execute(sql, params)]
+
+    def _count(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchone()[0]
+
+    def registered_players(self, limit=None, offset=0):
+        return self._query("SELECT * FROM players WHERE is_registered = 1 ORDER BY player_number", limit=limit, offset=offset)
+
+    def count_registered_players(self):
+        return self._count("SELECT COUNT(*) FROM players WHERE is_registered = 1")
+
+    def all_cards(self, limit=None, offset=0):
+        return self._query(
+            "SELECT cards.*, players.full_name FROM cards "
+            "LEFT JOIN players ON players.address = cards.player_address ORDER BY card_id",
+            limit=limit, offset=offset
+        )
+
+    def card(self, card_id):
+        with self._lock:
+            return self._card_row(card_id)
+
+    def cards_for_player(self, full_name, limit=None, offset=0):
+        return self._query(
+            "SELECT cards.*, players.full_name FROM cards "
+            "JOIN players ON players.address = cards.player_address "
+            "WHERE players.full_name = ? ORDER BY card_id",
+            (full_name,), limit=limit, offset=offset
+        )
+
+    def count_cards_for_player(self, full_name):
+        return self._count(
+            "SELECT COUNT(*) FROM cards JOIN players ON players.address = cards.player_address "
+            "WHERE players.full_name = ?",
+            (full_name,)
+        )
+
+    def points_history(self, card_id=None):
+        """Points changes in block order, for one card or all of them (see leaderboard.PointsHistory)."""
+        if card_id is None:
+            return self._query("SELECT * FROM points_history ORDER BY block_number, log_index")
+        return self._query(
+            "SELECT * FROM points_history WHERE card_id = ? ORDER BY block_number, log_index", (card_id,)
+        )
+
+    def cards_owned_by(self, owner):
+        return self._query("SELECT * FROM cards WHERE owner = ? ORDER BY card_id", (owner,))
+
+    def cards_for_sale(self):
+        return self._query(
+            "SELECT cards.* FROM listings JOIN cards ON cards.card_id = listings.card_id "
+            "ORDER BY listings.price_key, listings.card_id"
+        )
+
+    def listed_cards(self, league=None, season=None, position=None, min_price=None, max_price=None,
+                     min_points=None, max_points=None, sort="price", descending=False, cursor=None, limit=20):
+        """
+        One page of cards for sale, sorted by "price" (wei) or "points".
+
+        Returns (rows, next_cursor). Pass next_cursor back to get the following
+        page; it is None on the last page. Pages are keyset-paginated on the
+        listings indexes, so each costs O(limit) however large the market is.
+        """
+        column = LISTING_SORTS[sort]
+        conditions, params = [], []
+        for name, value in (("league", league), ("season", season), ("position", position)):
+            if value is not None:
+                conditions.append(f"listings.{name} = ?")
+                params.append(value)
+        for expression, value in (("listings.price_key >= ?", min_price), ("listings.price_key <= ?", max_price)):
+            if value is not None:
+                conditions.append(expression)
+                params.append(_price_key(value))
+        for expression, value in (("listings.fantasy_points >= ?", min_points), ("listings.fantasy_points <= ?", max_points)):
+            if value is not None:
+                conditions.append(expression)
+                params.append(value)
+
+        if cursor is not None:
+            sort_value, card_id = cursor.rsplit(":", 1)
+            conditions.append(f"({column}, listings.card_id) {'<' if descending else '>'} (?, ?)")
+            params += [sort_value if sort == "price" else int(sort_value), int(card_id)]
+
+        direction = "DESC" if descending else "ASC"
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        rows = self._query(
+            f"SELECT cards.*, players.full_name, listings.price_key FROM listings "
+            f"JOIN cards ON cards.card_id = listings.card_id "
+            f"LEFT JOIN players ON players.address = cards.player_address "
+            f"{where}ORDER BY {column} {direction}, listings.card_id {direction}",
+            params, limit=limit + 1
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = f"{last['price_key'] if sort == 'price' else last['fantasy_points']}:{last['card_id']}"
+        for row in rows:
+            del row["price_key"]
+        return rows, next_cursor
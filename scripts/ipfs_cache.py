@@ -0,0 +1,107 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# ===================== IPFS Content Cache =====================
+# CIDs are content addresses, so whatever a CID resolved to once is what it
+# will always resolve to. That makes the cache trivially coherent: there is
+# nothing to invalidate, only capacity to manage.
+
+class IPFSCache:
+    """
+    Two-level cache for IPFS JSON documents keyed by CID.
+
+    Level 1 is an in-process LRU of parsed objects, level 2 is a SQLite file
+    that survives restarts. The disk store is bounded in bytes and evicts the
+    least recently accessed documents first.
+    """
+
+    def __init__(self, db_path, max_memory_entries=1024, max_disk_bytes=64 * 1024 * 1024):
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Streamlit runs scripts on worker threads, so the connection is shared
+        # and every access goes through self._lock.
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS ipfs_objects ("
+            "cid TEXT PRIMARY KEY, data TEXT NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ipfs_objects_last_access ON ipfs_objects (last_access)")
+        self._db.commit()
+
+    def get(self, cid):
+        """Return the cached document for a CID, or None on a miss."""
+        with self._lock:
+            if cid in self._memory:
+                self._memory.move_to_end(cid)
+                self.stats["memory_hits"] += 1
+                return self._memory[cid]
+
+            row = self._db.execute("SELECT data FROM ipfs_objects WHERE cid = ?", (cid,)).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+
+            self._db.execute("UPDATE ipfs_objects SET last_access = ? WHERE cid = ?", (time.time(), cid))
+            self._db.commit()
+            value = json.loads(row[0])
+            self._remember(cid, value)
+            self.stats["disk_hits"] += 1
+            return value
+
+    def put(self, cid, value):
+        """Store a document in both levels and enforce the disk budget."""
+        data = json.dumps(value)
+        with self._lock:
+            self._remember(cid, value)
+            self._db.execute(
+                "INSERT OR REPLACE INTO ipfs_objects (cid, data, size, last_access) VALUES (?, ?, ?, ?)",
+                (cid, data, len(data), time.time())
+            )
+            self._evict_disk()
+            self._db.commit()
+
+    def get_or_fetch(self, cid, fetch):
+        """Return the cached document, calling fetch(cid) and caching its result on a miss."""
+        value = self.get(cid)
+        if value is not None:
+            return value
+
+        value = fetch(cid)
+        # Empty results are how fetch_from_ipfs reports gateway errors; don't pin those.
+        if value:
+            self.put(cid, value)
+        return value
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    def _remember(self, cid, value):
+        self._memory[cid] = value
+        self._memory.move_to_end(cid)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM ipfs_objects").fetchone()[0]
+        while total > self.max_disk_bytes:
+            row = self._db.execute("SELECT cid, size FROM ipfs_objects ORDER BY last_access LIMIT 1").fetchone()
+            if row is None:
+                break
+            self._db.execute("DELETE FROM ipfs_objects WHERE cid = ?", (row[0],))
+            total -= row[1]
+            self.stats["evictions"] += 1
@@ -0,0 +1,104 @@
+import hashlib
+
+# ===================== Local CIDv0 Computation =====================
+# Reproduces the CID `ipfs add` (and Pinata's pinFileToIPFS with default
+# options) assigns to a file: CIDv0, 256 KiB fixed-size chunks, balanced
+# UnixFS DAG with at most 174 links per node and no raw leaves. Only the
+# 34-byte hash of each node is kept, so memory stays constant in file size.
+
+CHUNK_SIZE = 262144
+MAX_LINKS = 174
+UNIXFS_FILE = 2
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def _varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _field_varint(number, value):
+    return _varint(number << 3) + _varint(value)
+
+
+def _field_bytes(number, value):
+    return _varint((number << 3) | 2) + _varint(len(value)) + value
+
+
+def _base58(data):
+    number = int.from_bytes(data, "big")
+    encoded = ""
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded = BASE58_ALPHABET[remainder] + encoded
+    leading_zeros = len(data) - len(data.lstrip(b"\0"))
+    return "1" * leading_zeros + encoded
+
+
+def _multihash(node):
+    return b"\x12\x20" + hashlib.sha256(node).digest()
+
+
+def _unixfs_file(data=None, filesize=0, blocksizes=()):
+    message = _field_varint(1, UNIXFS_FILE)
+    if data:
+        message += _field_bytes(2, data)
+    message += _field_varint(3, filesize)
+    for size in blocksizes:
+        message += _field_varint(4, size)
+    return message
+
+
+def _dag_node(links, unixfs):
+    # dag-pb writes Links (field 2) before Data (field 1)
+    encoded = b"".join(
+        _field_bytes(2, _field_bytes(1, link_hash) + _field_bytes(2, b"") + _field_varint(3, tsize))
+        for link_hash, tsize, _ in links
+    )
+    return encoded + _field_bytes(1, unixfs)
+
+
+def _leaf(chunk):
+    node = _dag_node([], _unixfs_file(chunk, len(chunk)))
+    # (hash, cumulative size of the encoded subtree, file bytes it covers)
+    return _multihash(node), len(node), len(chunk)
+
+
+def _parent(children):
+    filesize = sum(size for _, _, size in children)
+    node = _dag_node(children, _unixfs_file(filesize=filesize, blocksizes=[size for _, _, size in children]))
+    return _multihash(node), len(node) + sum(tsize for _, tsize, _ in children), filesize
+
+
+def file_cid(stream, chunk_size=CHUNK_SIZE):
+    """
+    CIDv0 of everything readable from `stream` (a binary file object). The
+    stream is rewound afterwards when it supports seek().
+    """
+    start = stream.tell() if hasattr(stream, "seek") else None
+    level = []
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        level.append(_leaf(chunk))
+    if start is not None:
+        stream.seek(start)
+
+    if not level:
+        level = [_leaf(b"")]
+    if len(level) == 1:
+        return _base58(level[0][0])
+
+    # Balanced layout: full subtrees on the left, grouped MAX_LINKS at a time
+    while len(level) > 1:
+        level = [_parent(level[i:i + MAX_LINKS]) for i in range(0, len(level), MAX_LINKS)]
+    return _base58(level[0][0])
@@ -0,0 +1,119 @@
+import time
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import http_client
+
+DEFAULT_GATEWAYS = ["https://ipfs.io/ipfs/"]
+
+# ===================== Gateway Pool =====================
+class GatewayStats:
+    """Exponentially weighted latency and error rate for one gateway."""
+
+    def __init__(self, url, alpha=0.2):
+        self.url = url
+        self.alpha = alpha
+        self.latency = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, latency=None, error=False):
+        self.requests += 1
+        if error:
+            self.errors += 1
+        self.error_rate = (1 - self.alpha) * self.error_rate + self.alpha * (1.0 if error else 0.0)
+        if latency is not None:
+            self.latency = latency if self.latency is None else (1 - self.alpha) * self.latency + self.alpha * latency
+
+    def score(self):
+        # Untried gateways rank first so every gateway gets measured; ones that
+        # have only ever failed rank last but stay available as a fallback.
+        if self.latency is None:
+            return float("inf") if self.errors else 0.0
+        return self.latency * (1 + 4 * self.error_rate)
+
+
+class GatewayPool:
+    """
+    Fetch IPFS JSON from several gateways, fastest first.
+
+    The best-ranked gateway is asked first. If it hasn't answered within the
+    hedge delay (a multiple of its typical latency), the next one is raced
+    against it, and so on; the first successful answer wins. Failures fall
+    through to the remaining gateways immediately.
+    """
+
+    def __init__(self, gateways=None, hedge_factor=2.0, min_hedge_delay=0.15, timeout=10.0, max_workers=16):
+        self.stats = [GatewayStats(url.rstrip("/") + "/") for url in (gateways or DEFAULT_GATEWAYS)]
+        self.hedge_factor = hedge_factor
+        self.min_hedge_delay = min_hedge_delay
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ipfs-gateway")
+
+    def ranked(self):
+        with self._lock:
+            return sorted(self.stats, key=lambda stats: stats.score())
+
+    def _hedge_delay(self, stats):
+        if stats.latency is None:
+            return self.min_hedge_delay
+        return max(self.min_hedge_delay, stats.latency * self.hedge_factor)
+
+    def _fetch_one(self, stats, ipfs_hash):
+        start = time.perf_counter()
+        try:
+            response = http_client.get(f"{stats.url}{ipfs_hash}", timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+        except Exception:
+            with self._lock:
+                stats.record(error=True)
+            raise
+        with self._lock:
+            stats.record(latency=time.perf_counter() - start)
+        return data
+
+    def fetch(self, ipfs_hash):
+        """Return the document for ipfs_hash; raises the last error if every gateway fails."""
+        pending = {}
+        queue = self.ranked()
+        last_error = None
+
+        while queue or pending:
+            if queue:
+                stats = queue.pop(0)
+                # Run in the caller's context so the request counts towards its metrics Scope
+                task = self._executor.submit(contextvars.copy_context().run, self._fetch_one, stats, ipfs_hash)
+                pending[task] = stats
+
+            # Wait for an answer, or until it's time to hedge with the next gateway.
+            delay = self._hedge_delay(stats) if queue else self.timeout
+            done, _ = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as err:
+                    last_error = err
+                    continue
+                # Losing requests finish in the background and still feed the stats.
+                return result
+
+        raise last_error or TimeoutError(f"No IPFS gateway answered for {ipfs_hash}")
+
+    def snapshot(self):
+        """Per-gateway stats, best first, for debugging and dashboards."""
+        return [
+            {
+                "gateway": stats.url,
+                "latency_ms": None if stats.latency is None else round(stats.latency * 1000, 1),
+                "error_rate": round(stats.error_rate, 3),
+                "requests": stats.requests,
+                "errors": stats.errors,
+            }
+            for stats in self.ranked()
+        ]
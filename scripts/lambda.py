@@ -1,32 +1,254 @@
+import os
 import json
+import time
+import base64
 import boto3
 
-s3 = boto3.client('s3')
+# S3_ENDPOINT_URL lets the handler run against a local S3 stand-in (moto server, MinIO)
+s3 = boto3.client('s3', endpoint_url=os.getenv("S3_ENDPOINT_URL") or None)
+
+# How long a warm container trusts its cached dataset before revalidating the ETag
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+
+# Upper bound on tuples resolved by one batch request
+MAX_BATCH_QUERIES = int(os.getenv("MAX_BATCH_QUERIES", "1000"))
+
+# Parsed dataset and lookup index, kept at module scope across warm invocations
+_cache = {
+    "key": None,
+    "etag": None,
+    "checked_at": 0.0,
+    "player_data": None,
+    "points_index": None,
+    "season_index": None,
+}
+
+# Per-invocation S3 timings, bytes and cache outcome, logged as one JSON line.
+# Kept inline so the function still deploys as a single file.
+_metrics = {}
+
+# ===================== Instrumentation =====================
+
+def start_invocation_metrics():
+    _metrics.clear()
+    _metrics.update(started=time.perf_counter(), s3={}, s3_bytes=0, cache=None)
+
+def timed_s3(operation, **kwargs):
+    """Call s3.<operation>(**kwargs), recording its count and latency for this invocation."""
+    start = time.perf_counter()
+    try:
+        return getattr(s3, operation)(**kwargs)
+    finally:
+        entry = _metrics.setdefault("s3", {}).setdefault(operation, {"count": 0, "total_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += (time.perf_counter() - start) * 1000
+
+def log_invocation_metrics(event, response):
+    print(json.dumps({
+        "metrics": {
+            "route": "batch" if is_post(event) else "get",
+            "status": response.get("statusCode"),
+            "duration_ms": round((time.perf_counter() - _metrics.get("started", time.perf_counter())) * 1000, 2),
+            "cache": _metrics.get("cache"),
+            "s3": {
+                operation: {"count": entry["count"], "total_ms": round(entry["total_ms"], 2)}
+                for operation, entry in _metrics.get("s3", {}).items()
+            },
+            "s3_bytes": _metrics.get("s3_bytes", 0),
+            "response_bytes": len(response.get("body") or ""),
+        }
+    }))
 
 # ===================== Utility Functions =====================
 
-def is_matching_player(player_json_entry, team, league, season):
-    """Check if the player matches the specified criteria."""
-    return player_json_entry['League'] == league and player_json_entry['Season'] == season and player_json_entry['Team'] == team
+# Columns of the aggregated points Parquet file (see columnar.points_json_to_table)
+POINTS_COLUMNS = ["Player Full Name", "Fantasy Points", "League", "Season", "Team"]
+
+def parse_points_parquet(body):
+    """
+    Read only the columns the lookups use from a Parquet points object and
+    return it in hodlerfc.json shape. pyarrow is imported here so JSON-only
+    deployments don't need the layer.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = pq.read_table(pa.BufferReader(body), columns=POINTS_COLUMNS).to_pydict()
+    player_data = {}
+    for player_name, points, league, season, team in zip(*(columns[column] for column in POINTS_COLUMNS)):
+        player_data.setdefault(player_name, []).append(
+            {"Fantasy Points": points, "League": league, "Season": season, "Team": team}
+        )
+    return player_data
 
 def fetch_player_data_from_s3(bucket_name, file_key):
-    """Retrieve player data from the S3 bucket."""
-    response = s3.get_object(Bucket=bucket_name, Key=file_key)
-    return json.loads(response['Body'].read().decode('utf-8'))
+    """Retrieve player data and its ETag from the S3 bucket (hodlerfc.json or a .parquet export of it)."""
+    response = timed_s3('get_object', Bucket=bucket_name, Key=file_key)
+    body = response['Body'].read()
+    _metrics["s3_bytes"] = _metrics.get("s3_bytes", 0) + len(body)
+    if file_key.endswith(".parquet"):
+        return parse_points_parquet(body), response['ETag']
+    return json.loads(body.decode('utf-8')), response['ETag']
+
+def build_points_index(player_data):
+    """Precompute (player, team, league, season) -> fantasy points."""
+    points_index = {}
+    for player_name, entries in player_data.items():
+        for entry in entries:
+            key = (player_name, entry['Team'], entry['League'], entry['Season'])
+            # Keep the first match, as the original linear scan did
+            points_index.setdefault(key, entry.get("Fantasy Points", ""))
+    return points_index
+
+def build_season_index(points_index):
+    """Group the points index by (league, season) -> [(player, team, points)] for whole-season queries."""
+    season_index = {}
+    for (player_name, team, league, season), points in points_index.items():
+        season_index.setdefault((league, season), []).append((player_name, team, points))
+    return season_index
+
+def clear_cache():
+    """Drop the warm-container cache (used by tests and after manual uploads)."""
+    _cache.update(key=None, etag=None, checked_at=0.0, player_data=None, points_index=None, season_index=None)
+
+def get_player_data(bucket_name, file_key):
+    """
+    Return (player_data, points_index), downloading and parsing only when the
+    object changed. Within the TTL no S3 call is made at all; after it, a
+    HEAD request revalidates the cached ETag.
+    """
+    key = (bucket_name, file_key)
+    now = time.monotonic()
+
+    if _cache["key"] == key and _cache["player_data"] is not None:
+        if now - _cache["checked_at"] < CACHE_TTL_SECONDS:
+            _metrics["cache"] = "ttl_hit"
+            return _cache["player_data"], _cache["points_index"]
+
+        if timed_s3('head_object', Bucket=bucket_name, Key=file_key)['ETag'] == _cache["etag"]:
+            _cache["checked_at"] = now
+            _metrics["cache"] = "etag_revalidated"
+            return _cache["player_data"], _cache["points_index"]
+
+    _metrics["cache"] = "miss"
+    player_data, etag = fetch_player_data_from_s3(bucket_name, file_key)
+    _cache.update(
+        key=key,
+        etag=etag,
+        checked_at=now,
+        player_data=player_data,
+        points_index=build_points_index(player_data)
+    )
+    _cache["season_index"] = build_season_index(_cache["points_index"])
+    return player_data, _cache["points_index"]
+
+def get_season_index():
+    """Season index for the dataset last returned by get_player_data."""
+    return _cache["season_index"]
+
+# ===================== Batch Queries =====================
+
+def parse_body(event):
+    body = event.get("body") or "{}"
+    if event.get("isBase64Encoded"):
+        body = base64.b64decode(body).decode('utf-8')
+    return json.loads(body)
+
+def is_query(query):
+    """A query is an object whose lookup fields, when present, are strings."""
+    return isinstance(query, dict) and all(
+        isinstance(query.get(field, ""), str) for field in ("playerName", "league", "season", "team")
+    )
+
+def resolve_queries(points_index, queries):
+    """Resolve many (playerName, league, season, team) tuples; unmatched tuples get None."""
+    results = []
+    for query in queries:
+        key = (query.get("playerName", ""), query.get("team", ""), query.get("league", ""), query.get("season", ""))
+        results.append({
+            "playerName": key[0],
+            "team": key[1],
+            "league": key[2],
+            "season": key[3],
+            "Fantasy Points": points_index.get(key)
+        })
+    return results
+
+def resolve_season(season_index, league, season, team=None):
+    """
+    Every (player, team) entry for a league and season, shaped like the batch
+    query results. A list rather than a dict keyed by player name, since one
+    player can score for more than one team in the same season.
+    """
+    return [
+        {"playerName": player_name, "team": player_team, "league": league, "season": season, "Fantasy Points": points}
+        for player_name, player_team, points in season_index.get((league, season), [])
+        if not team or player_team == team
+    ]
+
+def is_post(event):
+    method = event.get("httpMethod") or event.get("requestContext", {}).get("http", {}).get("method", "")
+    return method.upper() == "POST"
+
+def json_response(status_code, body):
+    return {
+        'statusCode': status_code,
+        'headers': {
+            'Content-Type': 'application/json',
+        },
+        'body': json.dumps(body)
+    }
+
+def handle_batch(event, points_index):
+    """
+    POST body is either {"queries": [{"playerName", "league", "season", "team"}, ...]}
+    or {"league": ..., "season": ..., "team": optional} for a whole league/season.
+    Both answer {"results": [{"playerName", "team", "league", "season", "Fantasy Points"}, ...]}.
+    """
+    try:
+        body = parse_body(event)
+    except ValueError:
+        return json_response(400, {"error": "Request body must be JSON"})
+    if not isinstance(body, dict):
+        return json_response(400, {"error": "Request body must be a JSON object"})
+
+    if "queries" in body:
+        queries = body["queries"]
+        if not isinstance(queries, list) or not all(is_query(query) for query in queries):
+            return json_response(400, {"error": "'queries' must be a list of objects with string fields"})
+        if len(queries) > MAX_BATCH_QUERIES:
+            return json_response(400, {"error": f"At most {MAX_BATCH_QUERIES} queries per request"})
+        return json_response(200, {"results": resolve_queries(points_index, queries)})
+
+    if body.get("league") and body.get("season") and is_query(body):
+        results = resolve_season(get_season_index(), body["league"], body["season"], body.get("team"))
+        return json_response(200, {"results": results})
+
+    return json_response(400, {"error": "Expected 'queries' or 'league' and 'season'"})
 
 # ===================== Lambda Handler =====================
 
 def lambda_handler(event, context):
     """Main AWS Lambda handler function."""
+    start_invocation_metrics()
+    response = handle_request(event)
+    log_invocation_metrics(event, response)
+    return response
+
+def handle_request(event):
+    """Route a GET (single player) or POST (batch) request."""
     bucket_name = os.getenv("BUCKET_NAME")
-    file_key = 'hodlerfc.json'
+    file_key = os.getenv("FILE_KEY", 'hodlerfc.json')
 
     try:
-        # Retrieve player data
-        player_data = fetch_player_data_from_s3(bucket_name, file_key)
+        # Retrieve player data (cached across warm invocations)
+        player_data, points_index = get_player_data(bucket_name, file_key)
+
+        if is_post(event):
+            return handle_batch(event, points_index)
         
         # Extract query parameters
-        query_parameters = event.get("queryStringParameters", {})
+        query_parameters = event.get("queryStringParameters") or {}
         player_name = query_parameters.get("playerName", "")
         league = query_parameters.get("league", "")
         team = query_parameters.get("team", "")
@@ -34,24 +256,17 @@ def lambda_handler(event, context):
 
         response_data = {}
         if player_name in player_data:
-            for entry in player_data[player_name]:
-                if is_matching_player(entry, team, league, season):
-                    response_data[player_name] = {
-                        "Fantasy Points": entry.get("Fantasy Points", "")
-                    }
-                    break  # Exit the loop once the matching entry is found
+            key = (player_name, team, league, season)
+            if key in points_index:
+                response_data[player_name] = {
+                    "Fantasy Points": points_index[key]
+                }
             else:
                 print("Matching criteria not found for player!")
         else:
             print("Invalid Input or Player not found!")
 
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-            },
-            'body': json.dumps(response_data)
-        }
+        return json_response(200, response_data)
 
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -0,0 +1,175 @@
+import os
+import json
+import heapq
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+
+# ===================== Leaderboards =====================
+class Leaderboards:
+    """
+    Standings per (league, season, position), kept sorted as updates arrive.
+
+    Each group is a sorted list of (-points, entry_id), so the top K of a
+    group is a slice and an update is a binary search plus one insert.
+    Entries are card IDs for on-chain cards or player tuples for scoring
+    output; nothing here cares which.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._groups = {}
+        self._entries = {}
+        self._file_lock = threading.Lock()
+        self._file_mtimes = {}
+        self._file_entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def update(self, entry_id, league, season, position, points):
+        group = (league, season, position)
+        with self._lock:
+            if self._entries.get(entry_id) == (group, points):
+                return
+            self._remove(entry_id)
+            insort(self._groups.setdefault(group, []), (-points, entry_id))
+            self._entries[entry_id] = (group, points)
+
+    def remove(self, entry_id):
+        with self._lock:
+            self._remove(entry_id)
+
+    def points(self, entry_id):
+        entry = self._entries.get(entry_id)
+        return entry[1] if entry else None
+
+    def top(self, league, season, position=None, k=10):
+        """[(entry_id, points)] best first; position=None merges every position in the season."""
+        with self._lock:
+            if position is not None:
+                ranked = self._groups.get((league, season, position), [])[:k]
+            else:
+                groups = [ranking for (group_league, group_season, _), ranking in self._groups.items()
+                          if group_league == league and group_season == season]
+                ranked = list(heapq.merge(*(ranking[:k] for ranking in groups)))[:k]
+        return [(entry_id, -negative_points) for negative_points, entry_id in ranked]
+
+    def rank(self, entry_id):
+        """1-based rank within the entry's own group (ties share the best rank), or None."""
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is None:
+                return None
+            group, points = entry
+            return bisect_left(self._groups[group], (-points,)) + 1
+
+    def _remove(self, entry_id):
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        group, points = entry
+        ranking = self._groups[group]
+        del ranking[bisect_left(ranking, (-points, entry_id))]
+        if not ranking:
+            del self._groups[group]
+
+    # ---------- Feeds ----------
+    def load_cards(self, cards):
+        """Seed from index rows (see ChainIndexer.all_cards); inactive cards are left out."""
+        for card in cards:
+            if card["is_active"]:
+                self.update(card["card_id"], card["league"], card["season"], card["position"], card["fantasy_points"])
+
+    def on_chain_event(self, event, card):
+        """ChainIndexer listener: new cards enter the board and point updates move them."""
+        if event["event"] in ("CardMinted", "FantasyPointsUpdated") and card["is_active"]:
+            self.update(card["card_id"], card["league"], card["season"], card["position"], card["fantasy_points"])
+
+    def load_points_json(self, player_data):
+        """
+        Apply player standings from scoring output shaped like hodlerfc.json,
+        either a whole file or the changed players MatchLog.apply_match_day()
+        returns. Entry IDs are (player, team, league, season, position) since
+        one player can appear in several groups; unchanged entries stay put.
+        Returns the set of entry IDs applied.
+        """
+        entry_ids = set()
+        for player_name, entries in player_data.items():
+            for entry in entries:
+                group = (entry["League"], entry["Season"], entry["Position"])
+                entry_id = (player_name, entry["Team"], *group)
+                self.update(entry_id, *group, entry["Fantasy Points"])
+                entry_ids.add(entry_id)
+        return entry_ids
+
+    def load_points_file(self, path):
+        """
+        Apply a hodlerfc.json-shaped file if it changed since the last call,
+        e.g. after match_log.py --export. Cheap enough to call on every rerun.
+        The file is the whole standings, so entries an earlier read of it
+        added that are missing now (a player dropped or moved to another
+        team or position) leave the board. Returns True when the file was read.
+        """
+        mtime = os.stat(path).st_mtime_ns
+        with self._file_lock:
+            if self._file_mtimes.get(path) == mtime:
+                return False
+            with open(path) as f:
+                entry_ids = self.load_points_json(json.load(f))
+            for entry_id in self._file_entries.get(path, set()) - entry_ids:
+                self.remove(entry_id)
+            self._file_entries[path] = entry_ids
+            self._file_mtimes[path] = mtime
+        return True
+
+
+# ===================== Points History =====================
+class PointsHistory:
+    """
+    Points over time per card as two parallel typed arrays (block number,
+    points), appended in block order. A range query is two binary searches
+    and a slice, whatever the history length.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def __len__(self):
+        return len(self._series)
+
+    def append(self, card_id, block_number, points):
+        with self._lock:
+            blocks, values = self._series.setdefault(card_id, (array("q"), array("q")))
+            if blocks and block_number < blocks[-1]:
+                # Out-of-order point (e.g. a reorg replay): keep the arrays sorted
+                index = bisect_right(blocks, block_number)
+                blocks.insert(index, block_number)
+                values.insert(index, points)
+            else:
+                blocks.append(block_number)
+                values.append(points)
+
+    def series(self, card_id, start_block=None, end_block=None):
+        """[(block_number, points)] for start_block <= block <= end_block."""
+        with self._lock:
+            blocks, values = self._series.get(card_id, ((), ()))
+            low = 0 if start_block is None else bisect_left(blocks, start_block)
+            high = len(blocks) if end_block is None else bisect_right(blocks, end_block)
+            return list(zip(blocks[low:high], values[low:high]))
+
+    def latest(self, card_id):
+        with self._lock:
+            blocks, values = self._series.get(card_id, ((), ()))
+            return (blocks[-1], values[-1]) if blocks else None
+
+    # ---------- Feeds ----------
+    def load(self, rows):
+        """Seed from ChainIndexer.points_history() rows, already in block order."""
+        for row in rows:
+            self.append(row["card_id"], row["block_number"], row["fantasy_points"])
+
+    def on_chain_event(self, event, card):
+        if event["event"] in ("CardMinted", "FantasyPointsUpdated"):
+            self.append(card["card_id"], event["blockNumber"], card["fantasy_points"])
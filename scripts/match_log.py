@@ -0,0 +1,163 @@
+import os
+import json
+import sqlite3
+import argparse
+from pathlib import Path
+
+from scoring import GROUP_COLUMNS, load_match_stats, calculate_fantasy_points_vectorized
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS match_days (
+    match_day TEXT PRIMARY KEY,
+    row_count INTEGER NOT NULL,
+    applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS match_rows (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    match_day TEXT NOT NULL REFERENCES match_days (match_day),
+    player TEXT NOT NULL,
+    fantasy_points INTEGER NOT NULL,
+    row_json TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS aggregates (
+    player TEXT NOT NULL,
+    league TEXT NOT NULL,
+    season TEXT NOT NULL,
+    team TEXT NOT NULL,
+    position TEXT NOT NULL,
+    fantasy_points INTEGER NOT NULL,
+    matches INTEGER NOT NULL,
+    PRIMARY KEY (player, league, season, team, position)
+);
+"""
+
+# ===================== Incremental Match Log =====================
+class MatchLog:
+    """
+    Append-only log of scored match rows with running per-player aggregates.
+
+    `apply_match_day()` scores only the new rows, adds their sums onto the
+    (player, league, season, team, position) aggregates and returns the
+    changed players in hodlerfc.json shape. Its cost depends on the size of
+    the match day, not on the season so far.
+    """
+
+    def __init__(self, db_path, score=calculate_fantasy_points_vectorized):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.score = score
+        self._db = sqlite3.connect(db_path)
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+
+    def has_match_day(self, match_day):
+        return self._db.execute("SELECT 1 FROM match_days WHERE match_day = ?", (match_day,)).fetchone() is not None
+
+    def apply_match_day(self, match_day, df):
+        """
+        Log and score one match day's rows (indexed by player, as load_match_stats returns).
+        Each match day can only be applied once.
+        """
+        if self.has_match_day(match_day):
+            raise ValueError(f"Match day {match_day} has already been applied")
+
+        df = df.copy()
+        df["Fantasy Points"] = self.score(df)
+        deltas = df.groupby(GROUP_COLUMNS)["Fantasy Points"].agg(["sum", "count"]).reset_index()
+
+        with self._db:
+            self._db.execute("INSERT INTO match_days (match_day, row_count) VALUES (?, ?)", (match_day, len(df)))
+            self._db.executemany(
+                "INSERT INTO match_rows (match_day, player, fantasy_points, row_json) VALUES (?, ?, ?, ?)",
+                [
+                    (match_day, player, int(row["Fantasy Points"]), row.to_json())
+                    for player, row in df.iterrows()
+                ]
+            )
+            self._db.executemany(
+                "INSERT INTO aggregates (player, league, season, team, position, fantasy_points, matches) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (player, league, season, team, position) DO UPDATE SET "
+                "fantasy_points = fantasy_points + excluded.fantasy_points, matches = matches + excluded.matches",
+                [
+                    (row["Player Full Name"], row["League"], row["Season"], row["Team"], row["Position"],
+                     int(row["sum"]), int(row["count"]))
+                    for _, row in deltas.iterrows()
+                ]
+            )
+
+        return self.players(deltas["Player Full Name"].unique())
+
+    def players(self, player_names):
+        """Return {player: [entries]} for the given players, shaped like hodlerfc.json."""
+        json_data = {}
+        for player_name in player_names:
+            rows = self._db.execute(
+                "SELECT fantasy_points, league, season, team, position FROM aggregates "
+                "WHERE player = ? ORDER BY league, season, team, position",
+                (player_name,)
+            ).fetchall()
+            json_data[player_name] = [self._entry(row) for row in rows]
+        return json_data
+
+    def players_all(self):
+        """Return every aggregate as {player: [entries]}."""
+        json_data = {}
+        rows = self._db.execute(
+            "SELECT player, fantasy_points, league, season, team, position FROM aggregates "
+            "ORDER BY player, league, season, team, position"
+        )
+        for player_name, *entry in rows:
+            json_data.setdefault(player_name, []).append(self._entry(entry))
+        return json_data
+
+    def export_points_json(self, file_path):
+        """Write every aggregate to a hodlerfc.json-compatible file."""
+        json_data = self.players_all()
+        with open(file_path, 'w') as json_file:
+            json.dump(json_data, json_file, indent=4)
+        return json_data
+
+    @staticmethod
+    def _entry(row):
+        fantasy_points, league, season, team, position = row
+        return {
+            "Fantasy Points": fantasy_points,
+            "League": league,
+            "Season": season,
+            "Team": team,
+            "Position": position
+        }
+
+
+# ===================== Command Line =====================
+def main():
+    parser = argparse.ArgumentParser(description="Score one match day and update the running aggregates.")
+    parser.add_argument("match_day", help="unique label for this match day, e.g. 2023-09-16_UPSL")
+    parser.add_argument("stats_path", type=Path, help="xlsx or parquet file containing only this match day's rows")
+    parser.add_argument("--sheet", default="Fantasy")
+    parser.add_argument("--db", default=os.getenv("MATCH_LOG_PATH", "../.cache/match_log.sqlite3"))
+    parser.add_argument("--export", type=Path, help="also write all aggregates to this .json, .parquet or .arrow path")
+    args = parser.parse_args()
+
+    if args.stats_path.suffix == ".parquet":
+        from columnar import read_match_stats
+        match_stats = read_match_stats(args.stats_path)
+    else:
+        match_stats = load_match_stats(args.stats_path, args.sheet)
+
+    match_log = MatchLog(args.db)
+    changed = match_log.apply_match_day(args.match_day, match_stats)
+    print(json.dumps(changed, indent=4))
+
+    if args.export and args.export.suffix == ".json":
+        match_log.export_points_json(args.export)
+    elif args.export:
+        from columnar import write_table, points_json_to_table
+        write_table(points_json_to_table(match_log.players_all()), args.export)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Latency histogram buckets in seconds (Prometheus-style upper bounds)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+logger = logging.getLogger("hodler.metrics")
+if os.getenv("METRICS_LOG", "").lower() in ("1", "true", "yes"):
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+# ===================== Registry =====================
+# Process-wide counters and latency histograms keyed by (name, labels).
+# Everything is cumulative. Each sample is also added to the Scope active in
+# the recording context (see Scope below), so one Streamlit rerun only sees
+# its own calls. Background threads (the chain index follower, the receipt
+# poller) run without a scope and only feed the process-wide registry.
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_active_scope = contextvars.ContextVar("metrics_scope", default=None)
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def add(name, value=1, **labels):
+    """Increase a counter, e.g. add("http_response_bytes_total", 512, host="ipfs.io")."""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+    scope = _active_scope.get()
+    while scope is not None:
+        scope._add(key, value)
+        scope = scope.parent
+
+
+def observe(name, seconds, **labels):
+    """Record one latency sample in the `name` histogram."""
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                histogram["buckets"][i] += 1
+                break
+        histogram["sum"] += seconds
+        histogram["count"] += 1
+    scope = _active_scope.get()
+    while scope is not None:
+        scope._observe(key, seconds)
+        scope = scope.parent
+
+
+@contextmanager
+def timed(name, **labels):
+    """Time the block into `{name}_seconds`; exceptions are counted in `{name}_errors_total`."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        add(f"{name}_errors_total", **labels)
+        raise
+    finally:
+        observe(f"{name}_seconds", time.perf_counter() - start, **labels)
+
+
+def record_cache(cache, hit):
+    add("cache_hits_total" if hit else "cache_misses_total", cache=cache)
+
+
+def snapshot():
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "histograms": {
+                key: {"buckets": list(value["buckets"]), "sum": value["sum"], "count": value["count"]}
+                for key, value in _histograms.items()
+            },
+        }
+
+
+def series_name(key):
+    name, labels = key
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{label}="{value}"' for label, value in labels) + "}"
+
+
+# ===================== Scopes =====================
+class Scope:
+    """
+    Everything recorded between start() and finish() by the starting thread
+    and the work it fans out (http_client.fetch_many carries the scope into
+    pool threads), e.g. one Streamlit rerun. Other sessions and background
+    threads record into their own scope or none, never into this one.
+    finish() also emits the summary as one JSON log line.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.parent = None
+        self._start = None
+        self._token = None
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._timings = {}
+
+    def start(self, root=False):
+        """
+        Make this the active scope. A root scope (e.g. one rerun) never nests
+        inside a scope left active by an earlier run that did not finish.
+        """
+        self._start = time.perf_counter()
+        self.parent = None if root else _active_scope.get()
+        self._token = _active_scope.set(self)
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.finish()
+
+    def _add(self, key, value):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def _observe(self, key, seconds):
+        with self._lock:
+            total, count = self._timings.get(key, (0.0, 0))
+            self._timings[key] = (total + seconds, count + 1)
+
+    def summary(self):
+        with self._lock:
+            counters = {series_name(key): value for key, value in self._counters.items()}
+            timings = {
+                series_name(key): {"count": count, "total_ms": round(total * 1000, 2),
+                                   "mean_ms": round(total * 1000 / count, 2)}
+                for key, (total, count) in self._timings.items()
+            }
+        return {
+            "scope": self.name,
+            "duration_ms": round((time.perf_counter() - self._start) * 1000, 2),
+            "timings": timings,
+            "counters": counters,
+        }
+
+    def finish(self):
+        if self._token is not None:
+            try:
+                _active_scope.reset(self._token)
+            except ValueError:
+                pass  # Finished from another context; that context's scope ends with it
+            self._token = None
+        summary = self.summary()
+        logger.info(json.dumps(summary))
+        return summary
+
+
+# ===================== Web3 Middleware =====================
+def web3_middleware(make_request, w3):
+    """Time every JSON-RPC request web3 makes, by method: w3.middleware_onion.add(web3_middleware)."""
+    def middleware(method, params):
+        with timed("rpc_request", method=method):
+            response = make_request(method, params)
+        if isinstance(response, dict) and "error" in response:
+            add("rpc_request_errors_total", method=method)
+        return response
+    return middleware
+
+
+# ===================== Prometheus Exposition =====================
+def render_prometheus():
+    """Render the registry in the Prometheus text exposition format."""
+    current = snapshot()
+    lines = []
+    for key, value in sorted(current["counters"].items()):
+        lines.append(f"{series_name(key)} {value}")
+    for (name, labels), value in sorted(current["histograms"].items()):
+        cumulative = 0
+        for bound, count in zip(BUCKETS, value["buckets"]):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{series_name((name + '_bucket', labels + (('le', le),)))} {cumulative}")
+        lines.append(f"{series_name((name + '_sum', labels))} {value['sum']}")
+        lines.append(f"{series_name((name + '_count', labels))} {value['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def start_http_server(port, host="0.0.0.0"):
+    """Serve GET /metrics on a daemon thread and return the server."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
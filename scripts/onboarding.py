@@ -0,0 +1,176 @@
+import os
+import csv
+import json
+import time
+import argparse
+import contextvars
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from web3.exceptions import TransactionNotFound
+
+import http_client
+from ipfs_cid import file_cid
+from pinata import pin_file_to_ipfs, pin_json_to_ipfs
+from rpc_batch import fetch_player_infos
+
+ROSTER_COLUMNS = ["address", "name", "lastName", "nationality", "dob", "phone", "selfie"]
+
+# onboard_roster calls pin_player from http_client.fetch_many pool threads,
+# where a nested fetch_many runs inline, so selfie uploads get their own pool.
+_selfie_executor = ThreadPoolExecutor(max_workers=http_client.MAX_CONCURRENCY, thread_name_prefix="selfie-pin")
+
+# ===================== Player Pins =====================
+def pin_player(selfie, player_data):
+    """
+    Pin a selfie and the player's metadata, which references it, at the same time.
+
+    The selfie's CID is computed locally, so the metadata can name it before
+    the upload finishes. Returns (metadata hash, metadata).
+    """
+    selfie_hash = file_cid(selfie)
+    player_data = {**player_data, "selfieHash": selfie_hash}
+    selfie_pin = _selfie_executor.submit(contextvars.copy_context().run, pin_file_to_ipfs, selfie, selfie_hash)
+    player_data_hash = pin_json_to_ipfs(player_data)
+    pinned_selfie = selfie_pin.result()
+
+    # Only if Pinata hashed the file differently: point the metadata at its CID instead
+    if pinned_selfie != selfie_hash:
+        player_data = {**player_data, "selfieHash": pinned_selfie}
+        player_data_hash = pin_json_to_ipfs(player_data)
+    return player_data_hash, player_data
+
+
+# ===================== Bulk Roster =====================
+def load_roster(csv_path):
+    """Read roster rows; selfie paths are resolved relative to the CSV file."""
+    csv_path = Path(csv_path)
+    with open(csv_path, newline="") as f:
+        reader = csv.DictReader(f)
+        missing = [column for column in ROSTER_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Roster is missing columns: {', '.join(missing)}")
+        rows = list(reader)
+    for row in rows:
+        row["selfie"] = csv_path.parent / row["selfie"]
+    return rows
+
+
+def _pin_row(row):
+    player_data = {column: row[column] for column in ROSTER_COLUMNS if column not in ("address", "selfie")}
+    with open(row["selfie"], "rb") as selfie:
+        player_data_hash, _ = pin_player(selfie, player_data)
+    return player_data_hash
+
+
+def _status(tx_manager, tx_hash):
+    status = tx_manager.status(tx_hash)
+    if status is None:
+        # Finished and trimmed from the manager's history; the node still has the receipt unless it was dropped
+        try:
+            receipt = tx_manager.w3.eth.getTransactionReceipt(tx_hash)
+        except TransactionNotFound:
+            return {"tx_hash": tx_hash, "status": "dropped"}
+        status = {"tx_hash": tx_hash, "status": "confirmed" if receipt["status"] else "failed"}
+    return status
+
+
+def _wait(tx_manager, tx_hashes, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if all(_status(tx_manager, tx_hash)["status"] != "pending" for tx_hash in tx_hashes):
+            break
+        time.sleep(tx_manager.poll_interval)
+    return {tx_hash: _status(tx_manager, tx_hash) for tx_hash in tx_hashes}
+
+
+def onboard_roster(w3, player_registration_contract, tx_manager, rows, admin=None, timeout=300):
+    """
+    Register every roster player. Pins for all players run concurrently, and
+    while they upload the admin (if given) waitlists anyone not yet on the
+    waitlist. Each registerPlayer is then sent from the player's own address,
+    so the node must hold those accounts (as with the app's account picker).
+
+    Returns one result dict per row: address, name, status, ipfs_hash, tx_hash.
+    """
+    infos = fetch_player_infos(w3, player_registration_contract, [row["address"] for row in rows])
+    results = {row["address"]: {"address": row["address"], "name": f"{row['name']} {row['lastName']}",
+                                "status": "pending", "ipfs_hash": None, "tx_hash": None} for row in rows}
+    todo = []
+    for row in rows:
+        if infos[row["address"]][2]:
+            results[row["address"]]["status"] = "already registered"
+        elif not infos[row["address"]][3] and admin is None:
+            results[row["address"]]["status"] = "not waitlisted"
+        else:
+            todo.append(row)
+
+    waitlist_hashes = [
+        tx_manager.submit(f"Waitlist {row['address']}",
+                          player_registration_contract.functions.addToWaitlist(row["address"]), {'from': admin})
+        for row in todo if not infos[row["address"]][3]
+    ]
+
+    def pin(row):
+        try:
+            return _pin_row(row)
+        except Exception as err:
+            return err
+
+    # Uploads overlap with the waitlist transactions confirming
+    pinned = http_client.fetch_many(pin, todo)
+    waitlisted = _wait(tx_manager, waitlist_hashes, timeout)
+    if any(status["status"] != "confirmed" for status in waitlisted.values()):
+        failed = [tx_hash for tx_hash, status in waitlisted.items() if status["status"] != "confirmed"]
+        raise RuntimeError(f"Waitlisting did not confirm: {failed}")
+
+    register_hashes = []
+    for row, player_data_hash in zip(todo, pinned):
+        result = results[row["address"]]
+        if isinstance(player_data_hash, Exception):
+            result["status"] = f"pin failed: {player_data_hash}"
+            continue
+        result["ipfs_hash"] = player_data_hash
+        try:
+            result["tx_hash"] = tx_manager.submit(
+                f"Register {result['name']}",
+                player_registration_contract.functions.registerPlayer(player_data_hash),
+                {'from': row["address"]}
+            )
+            register_hashes.append(result["tx_hash"])
+        except ValueError as err:
+            result["status"] = f"transaction error: {err}"
+
+    by_tx_hash = {result["tx_hash"]: result for result in results.values() if result["tx_hash"]}
+    for tx_hash, status in _wait(tx_manager, register_hashes, timeout).items():
+        by_tx_hash[tx_hash]["status"] = status["status"]
+    return list(results.values())
+
+
+def main():
+    from web3 import Web3
+    from tx_manager import TransactionManager
+
+    parser = argparse.ArgumentParser(description="Register every player in a roster CSV.")
+    parser.add_argument("roster", type=Path, help=f"CSV with columns: {', '.join(ROSTER_COLUMNS)}")
+    parser.add_argument("--admin", help="admin address that waitlists players who are not on the waitlist yet")
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds to wait for confirmations")
+    args = parser.parse_args()
+
+    provider_uri = os.getenv("WEB3_PROVIDER_URI")
+    w3 = Web3(Web3.HTTPProvider(provider_uri, session=http_client.get_session(provider_uri)))
+    with open(Path('../metadata/player_registration_abi.json')) as f:
+        player_registration_contract = w3.eth.contract(
+            address=os.getenv("PLAYER_REGISTRATION_CONTRACT_ADDRESS"),
+            abi=json.load(f)
+        )
+
+    rows = load_roster(args.roster)
+    # Room for every waitlist and registration transaction in the status table
+    tx_manager = TransactionManager(w3, history=max(200, 2 * len(rows)))
+    results = onboard_roster(w3, player_registration_contract, tx_manager, rows, admin=args.admin, timeout=args.timeout)
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
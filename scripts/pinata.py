@@ -1,10 +1,40 @@
 import os
 import json
+import logging
 import requests
 from dotenv import load_dotenv
 
+import http_client
+import metrics
+from ipfs_cid import file_cid
+from ipfs_cache import IPFSCache
+from ipfs_gateways import GatewayPool
+
 load_dotenv('../SAMPLE.env')
 
+logger = logging.getLogger(__name__)
+
+# ================ IPFS Cache ==================
+ipfs_cache = IPFSCache(
+    os.getenv("IPFS_CACHE_PATH", "../.cache/ipfs_cache.sqlite3"),
+    max_memory_entries=int(os.getenv("IPFS_CACHE_MEMORY_ENTRIES", "1024")),
+    max_disk_bytes=int(os.getenv("IPFS_CACHE_DISK_BYTES", str(64 * 1024 * 1024))),
+)
+
+# =============== IPFS Gateways ================
+# Comma-separated, e.g. a dedicated Pinata gateway, a local Kubo node and public gateways
+gateway_pool = GatewayPool(
+    [url.strip() for url in os.getenv(
+        "IPFS_GATEWAYS",
+        "https://gateway.pinata.cloud/ipfs/,https://ipfs.io/ipfs/,https://dweb.link/ipfs/"
+    ).split(",") if url.strip()],
+    hedge_factor=float(os.getenv("IPFS_HEDGE_FACTOR", "2.0")),
+    timeout=http_client.DEFAULT_TIMEOUT
+)
+
+# Pinning API base URL; overridable so benchmarks can point it at a local stub
+PINATA_API_URL = os.getenv("PINATA_API_URL", "https://api.pinata.cloud").rstrip("/")
+
 # ================== Headers ===================
 json_headers = {
     "Content-Type": "application/json",
@@ -30,23 +60,68 @@ def convert_data_to_json(content):
     return json.dumps(data)
 
 
+# ========= Already-Pinned Check ===============
+# CIDs known to be pinned in this process, so repeat uploads skip the API call too
+_known_pins = set()
+
+
+def is_pinned(ipfs_hash):
+    """
+    True if Pinata already has ipfs_hash pinned. Errors count as "not pinned"
+    so the caller just uploads.
+    """
+    if ipfs_hash in _known_pins:
+        return True
+    try:
+        r = http_client.get(
+            f"{PINATA_API_URL}/data/pinList",
+            params={"hashContains": ipfs_hash, "status": "pinned", "pageLimit": 1},
+            headers=file_headers
+        )
+        pinned = r.ok and r.json().get("count", 0) > 0
+    except (requests.RequestException, ValueError):
+        return False
+    if pinned:
+        _known_pins.add(ipfs_hash)
+    return pinned
+
+
 # ========== Pin File to IPFS via Pinata ========
-def pin_file_to_ipfs(data):
+def pin_file_to_ipfs(data, ipfs_hash=None):
     """
     Pins a file to IPFS using Pinata's pinFileToIPFS endpoint.
+
+    `data` is a binary file object (e.g. a Streamlit UploadedFile). Its CID is
+    computed locally first (or passed in as ipfs_hash) and the upload is
+    skipped when Pinata already has it; otherwise the file is streamed rather
+    than buffered into the request.
     """
-    r = requests.post(
-        "https://api.pinata.cloud/pinning/pinFileToIPFS",
-        files={'file': data},
-        headers=file_headers
-    )
+    ipfs_hash = ipfs_hash or file_cid(data)
+    if is_pinned(ipfs_hash):
+        metrics.record_cache("pinata_pin", hit=True)
+        return ipfs_hash
+    metrics.record_cache("pinata_pin", hit=False)
+
+    filename = os.path.basename(getattr(data, "name", "") or "file")
+    body = http_client.MultipartStream("file", filename, data, getattr(data, "type", None) or "application/octet-stream")
+    start = data.tell()
+    with metrics.timed("pinata_pin", kind="file"):
+        r = http_client.post(
+            f"{PINATA_API_URL}/pinning/pinFileToIPFS",
+            data=body,
+            headers={**file_headers, "Content-Type": body.content_type}
+        )
+    data.seek(start)  # Leave the file where we found it, as file_cid does
     response_json = r.json()
-    print(response_json)  # For debugging purposes.
+    logger.debug("pinFileToIPFS response: %s", response_json)
     
     if "IpfsHash" not in response_json:
         raise Exception("Unexpected response format from Pinata. 'IpfsHash' key not found. Response:", response_json)
-        
+
+    if response_json["IpfsHash"] != ipfs_hash:
+        logger.warning("Pinata returned %s for a file hashed locally as %s", response_json["IpfsHash"], ipfs_hash)
     ipfs_hash = response_json["IpfsHash"]
+    _known_pins.add(ipfs_hash)
     return ipfs_hash
 
 
@@ -58,30 +133,54 @@ def pin_json_to_ipfs(data):
     # Convert the data to a serialized JSON string
     json_data = json.dumps(data)
 
-    r = requests.post(
-        "https://api.pinata.cloud/pinning/pinJSONToIPFS",
-        data=json_data,  # Note: you're sending the serialized JSON string now
-        headers=json_headers  # Make sure this has "Content-Type": "application/json"
-    )
+    with metrics.timed("pinata_pin", kind="json"):
+        r = http_client.post(
+            f"{PINATA_API_URL}/pinning/pinJSONToIPFS",
+            data=json_data,  # Note: you're sending the serialized JSON string now
+            headers=json_headers  # Make sure this has "Content-Type": "application/json"
+        )
     response_json = r.json()
-    print(response_json)  # For debugging purposes.
+    logger.debug("pinJSONToIPFS response: %s", response_json)
     
     if "IpfsHash" not in response_json:
         raise Exception("Unexpected response format from Pinata. 'IpfsHash' key not found. Response:", response_json)
 
     ipfs_hash = response_json["IpfsHash"]
+    ipfs_cache.put(ipfs_hash, data)  # We already know what this CID resolves to
     return ipfs_hash
 
 
 # ========= Fetch Data from IPFS via Pinata ========
 def fetch_from_ipfs(ipfs_hash):
     """
-    Fetches data from IPFS using ipfs.io gateway.
+    Fetches data from IPFS, serving from the local CID cache when possible.
+    """
+    fetched = []
+
+    def fetch(missing_hash):
+        fetched.append(missing_hash)
+        return _fetch_from_gateway(missing_hash)
+
+    with metrics.timed("ipfs_fetch"):
+        data = ipfs_cache.get_or_fetch(ipfs_hash, fetch)
+    metrics.record_cache("ipfs", hit=not fetched)
+    return data
+
+
+def fetch_many_from_ipfs(ipfs_hashes):
+    """
+    Fetches many IPFS documents concurrently, returning {ipfs_hash: data}.
+    """
+    unique_hashes = list(dict.fromkeys(ipfs_hashes))
+    return dict(zip(unique_hashes, http_client.fetch_many(fetch_from_ipfs, unique_hashes)))
+
+
+def _fetch_from_gateway(ipfs_hash):
+    """
+    Fetches data from IPFS, racing the gateway pool and keeping the fastest answer.
     """
     try:
-        response = requests.get(f"https://ipfs.io/ipfs/{ipfs_hash}")
-        response.raise_for_status()  # Raise an error for bad responses
-        return response.json()
-    except requests.RequestException as err:
+        return gateway_pool.fetch(ipfs_hash)
+    except (requests.RequestException, ValueError, TimeoutError) as err:
         print(f"Error fetching data from IPFS: {err}")
         return {}
\ No newline at end of file
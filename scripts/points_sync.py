@@ -0,0 +1,128 @@
+import json
+from pathlib import Path
+
+import http_client
+from rpc_batch import fetch_cards
+
+DEFAULT_MAX_BATCH_SIZE = 200
+DEFAULT_MAX_GAS = 8_000_000
+GAS_HEADROOM = 1.2
+
+# ===================== Score Table =====================
+def load_points_table(path=Path('../metadata/hodlerfc.json')):
+    """Load hodlerfc.json into {(player, league, season, team): fantasy points}."""
+    with open(path) as f:
+        player_data = json.load(f)
+
+    return {
+        (player_name, entry["League"], entry["Season"], entry["Team"]): entry["Fantasy Points"]
+        for player_name, entries in player_data.items()
+        for entry in entries
+    }
+
+
+def fetch_season_points(api_gateway_url, league, season):
+    """Fetch a whole league/season from the Lambda batch endpoint in one request."""
+    response = http_client.post(api_gateway_url, json={"league": league, "season": season}, timeout=30)
+    response.raise_for_status()
+    return {
+        (entry["playerName"], league, season, entry["team"]): entry["Fantasy Points"]
+        for entry in response.json()["results"]
+    }
+
+
+# ===================== Diff Against Chain =====================
+def diff_card_points(w3, player_card_contract, cards, points_table, league=None, season=None):
+    """
+    Return [(card_id, new_points)] for active cards whose on-chain points differ
+    from the score table. `cards` are index rows (see ChainIndexer.all_cards).
+
+    fantasyPoints is a uint256, so negative season totals are stored as 0.
+    """
+    candidates = {}
+    for card in cards:
+        if not card["is_active"]:
+            continue
+        if (league and card["league"] != league) or (season and card["season"] != season):
+            continue
+        key = (card["full_name"], card["league"], card["season"], card["team"])
+        if key in points_table:
+            candidates[card["card_id"]] = max(0, int(points_table[key]))
+
+    on_chain = fetch_cards(w3, player_card_contract, list(candidates))
+    return [
+        (card_id, points)
+        for card_id, points in candidates.items()
+        if on_chain[card_id][6] != points  # fantasyPoints is the seventh item in the struct
+    ]
+
+
+# ===================== Gas-Bounded Batches =====================
+def pack_batches(player_card_contract, sender, updates, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_gas=DEFAULT_MAX_GAS):
+    """
+    Split updates into updateFantasyPointsBatch calls that each fit under max_gas.
+    Returns [(card_ids, points, gas_limit)].
+
+    A batch over the block gas limit makes estimateGas fail rather than return
+    a large number, so a failed estimate also halves the batch; only a single
+    card that cannot be estimated raises.
+    """
+    batches = []
+    remaining = list(updates)
+    size = max_batch_size
+
+    while remaining:
+        chunk = remaining[:size]
+        card_ids = [card_id for card_id, _ in chunk]
+        points = [points for _, points in chunk]
+        try:
+            gas = player_card_contract.functions.updateFantasyPointsBatch(card_ids, points).estimateGas({'from': sender})
+        except Exception:
+            if size == 1:
+                raise
+            size = max(1, size // 2)
+            continue
+
+        if gas * GAS_HEADROOM > max_gas and size > 1:
+            size = max(1, size // 2)
+            continue
+
+        batches.append((card_ids, points, min(int(gas * GAS_HEADROOM), max_gas)))
+        remaining = remaining[size:]
+
+    return batches
+
+
+# ===================== Submission =====================
+def send_batches(tx_manager, player_card_contract, sender, batches):
+    """
+    Submit every batch through the transaction manager (see tx_manager.py),
+    which assigns the sender's nonces and polls for receipts, without waiting
+    for any of them to be mined. Returns [(card_ids, tx_hash or exception)].
+    """
+    submitted = []
+    for card_ids, points, gas in batches:
+        try:
+            tx_hash = tx_manager.submit(
+                f"Update fantasy points for {len(card_ids)} cards",
+                player_card_contract.functions.updateFantasyPointsBatch(card_ids, points),
+                {'from': sender, 'gas': gas},
+                on_confirmed=lambda receipt, count=len(card_ids): f"Fantasy points updated on-chain for {count} cards!"
+            )
+        except Exception as err:
+            # A timeout on one batch must not drop the hashes of those already sent
+            tx_hash = err
+        submitted.append((card_ids, tx_hash))
+    return submitted
+
+
+def sync_season_points(w3, tx_manager, player_card_contract, sender, cards, points_table, league=None, season=None,
+                       max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_gas=DEFAULT_MAX_GAS):
+    """Submit every changed card's points in as few transactions as possible."""
+    updates = diff_card_points(w3, player_card_contract, cards, points_table, league, season)
+    if not updates:
+        return {"updated_cards": 0, "results": []}
+
+    batches = pack_batches(player_card_contract, sender, updates, max_batch_size, max_gas)
+    results = send_batches(tx_manager, player_card_contract, sender, batches)
+    return {"updated_cards": len(updates), "results": results}
@@ -0,0 +1,113 @@
+import os
+from web3 import Web3
+from eth_utils.abi import collapse_if_tuple
+
+import http_client
+import metrics
+
+DEFAULT_BATCH_SIZE = int(os.getenv("RPC_BATCH_SIZE", "100"))
+
+# ===================== Batched Contract Reads =====================
+# View calls are packed into JSON-RPC batch requests (an array of eth_call
+# objects in a single HTTP POST). Unlike Multicall this needs no helper
+# contract on chain, so it works unchanged against Ganache, Anvil and Infura.
+
+def _function_abi(contract, fn_name):
+    for entry in contract.abi:
+        if entry.get("type") == "function" and entry.get("name") == fn_name:
+            return entry
+    raise ValueError(f"Function {fn_name} not found in contract ABI")
+
+
+def _normalize(abi_type, value):
+    """Match the output normalization web3 applies to ContractFunction.call()."""
+    if abi_type == "address":
+        return Web3.toChecksumAddress(value)
+    if abi_type == "string" and isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
+
+
+def _decode(w3, fn_abi, raw):
+    outputs = fn_abi["outputs"]
+    types = [collapse_if_tuple(output) for output in outputs]
+    values = w3.codec.decode_abi(types, Web3.toBytes(hexstr=raw))
+    values = [_normalize(abi_type, value) for abi_type, value in zip(types, values)]
+    return values[0] if len(values) == 1 else values
+
+
+def batch_call(w3, calls, batch_size=None, block_identifier="latest"):
+    """
+    Execute many contract view calls with as few round trips as possible.
+
+    `calls` is a list of (contract, function_name, args) tuples, or
+    (contract, function_name, args, block_identifier) to read one call at its
+    own block. Results come back in the same order, decoded the same way
+    ContractFunction.call() would.
+    """
+    if not calls:
+        return []
+
+    batch_size = batch_size or DEFAULT_BATCH_SIZE
+    endpoint = getattr(w3.provider, "endpoint_uri", None)
+    calls = [call if len(call) == 4 else (*call, block_identifier) for call in calls]
+
+    # Non-HTTP providers (IPC, eth-tester) can't take a batch payload.
+    if endpoint is None:
+        return [
+            getattr(contract.functions, fn_name)(*args).call(block_identifier=call_block)
+            for contract, fn_name, args, call_block in calls
+        ]
+
+    def run_chunk(start):
+        chunk = calls[start:start + batch_size]
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "id": start + i,
+                "method": "eth_call",
+                "params": [
+                    {"to": contract.address, "data": contract.encodeABI(fn_name=fn_name, args=list(args))},
+                    call_block if isinstance(call_block, str) else hex(call_block)
+                ]
+            }
+            for i, (contract, fn_name, args, call_block) in enumerate(chunk)
+        ]
+
+        with metrics.timed("rpc_batch", method="eth_call"):
+            response = http_client.post(endpoint, json=payload, timeout=30)
+            response.raise_for_status()
+        metrics.add("rpc_batch_calls_total", len(chunk), method="eth_call")
+        replies = {reply["id"]: reply for reply in response.json()}
+
+        decoded = []
+        for i, (contract, fn_name, args, _) in enumerate(chunk):
+            reply = replies.get(start + i)
+            if reply is None or "error" in reply:
+                raise ValueError(reply["error"] if reply else f"No response for {fn_name}{tuple(args)}")
+            decoded.append(_decode(w3, _function_abi(contract, fn_name), reply["result"]))
+        return decoded
+
+    # Chunks are independent, so they go out concurrently over the pooled session.
+    chunk_results = http_client.fetch_many(run_chunk, range(0, len(calls), batch_size))
+    return [result for chunk in chunk_results for result in chunk]
+
+
+# ===================== Bulk Readers =====================
+def fetch_cards(w3, player_card_contract, card_ids, batch_size=None):
+    """Return {card_id: Card struct} for every requested card."""
+    calls = [(player_card_contract, "cards", [card_id]) for card_id in card_ids]
+    return dict(zip(card_ids, batch_call(w3, calls, batch_size)))
+
+
+def fetch_cards_at(w3, player_card_contract, card_blocks, batch_size=None):
+    """Return {card_id: Card struct} with each card read at its own block, from [(card_id, block_number)]."""
+    calls = [(player_card_contract, "cards", [card_id], block_number) for card_id, block_number in card_blocks]
+    return dict(zip([card_id for card_id, _ in card_blocks], batch_call(w3, calls, batch_size)))
+
+
+def fetch_player_infos(w3, player_registration_contract, addresses, batch_size=None):
+    """Return {address: PlayerInfo struct}, querying each distinct address once."""
+    unique_addresses = list(dict.fromkeys(addresses))
+    calls = [(player_registration_contract, "playerInfos", [address]) for address in unique_addresses]
+    return dict(zip(unique_addresses, batch_call(w3, calls, batch_size)))
@@ -0,0 +1,181 @@
+import warnings
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# ===================== Match Stats Loading =====================
+def load_match_stats(excel_path=Path("../resources/HMFC_2023-1.xlsx"), sheet_name="Fantasy"):
+    """
+    Load the per-match stats sheet the same way the fantasy points notebook does.
+    """
+    # Suppress the specific warning about data validation
+    warnings.filterwarnings("ignore", category=UserWarning, message="Data Validation extension is not supported")
+
+    df = pd.read_excel(excel_path, sheet_name, index_col="Player Full Name")
+    df.fillna(0, inplace=True)
+    df.index = df.index.str.replace(',', '')
+    return df
+
+
+# ===================== Row-wise Reference =====================
+def calculate_fantasy_points(row):
+    """
+    Original row-wise scoring from fantasy_points_calculation.ipynb, kept as
+    the reference implementation for parity checks and benchmarks.
+    """
+    points = 0
+
+    # Minutes Played
+    if row["Minutes Played"] < 60:
+        points += 1
+    else:
+        points += 2
+
+    # Goal points based on Position
+    if not pd.isna(row["Goal"]):
+        if row["Position"] == "GOA" or row["Position"] == "DEF":
+            points += 6
+        elif row["Position"] == "MID":
+            points += 5
+        elif row["Position"] == "STR":
+            points += 4
+
+    # Goal Assist
+    if not pd.isna(row["Goal Assist"]):
+        points += 3
+
+    # Clean Sheet points
+    if row["Position"] == "GOA" and row["Minutes Played"] > 60:
+        points += 4
+    elif row["Position"] == "DEF" and row["Minutes Played"] > 60:
+        points += 3
+    elif row["Position"] == "MID" and row["Minutes Played"] > 60:
+        points += 2
+    elif row["Position"] == "STR" and row["Minutes Played"] > 60:
+        points += 1
+
+    # Missed Penalty
+    if not pd.isna(row["Penalties Missed"]):
+        points -= 2
+
+    # Saved Penalty
+    if not pd.isna(row["Penalties Saved"]):
+        points += 5
+
+    # Provoked Penalty
+    if row["Penalties Won"] > 0:
+        points += 2
+
+    # Penalty Committed
+    if not pd.isna(row["Penalties Committed"]):
+        points -= 2
+
+    # Conceded Goals points
+    if (row["Position"] == "GOA" or row["Position"] == "DEF") and row["Goal Against"] > 0:
+        points -= row["Goal Against"] // 2 * 2
+    elif (row["Position"] == "MID" or row["Position"] == "STR") and row["Goal Against"] > 0:
+        points -= row["Goal Against"] // 2
+
+    # Yellow Card
+    if not pd.isna(row["Yellow Card"]):
+        points -= 1
+
+    # Second Yellow Card
+    if not pd.isna(row["Red Card"]) and row["Red Card"] == "Second Yellow Card":
+        points -= 1
+
+    # Red Card
+    if not pd.isna(row["Red Card"]) and row["Red Card"] == "Red Card":
+        points -= 3
+
+    # Hodler points:
+    points += row["Hodler Mark Points"]
+
+    return points
+
+
+# ===================== Vectorized Scoring =====================
+def _present(column):
+    """Mirror the reference's `not pd.isna(...)` checks (after fillna(0) these are always true)."""
+    return (~column.isna()).to_numpy()
+
+
+def calculate_fantasy_points_vectorized(df):
+    """
+    Score every match row at once with column operations.
+
+    Produces exactly the totals of calculate_fantasy_points(row) applied with
+    df.apply(..., axis=1), including its presence-based (not count-based)
+    checks on event columns.
+    """
+    position = df["Position"].to_numpy()
+    minutes = df["Minutes Played"].to_numpy()
+    goals_against = df["Goal Against"].to_numpy()
+    red_card = df["Red Card"]
+
+    is_goa_def = np.isin(position, ["GOA", "DEF"])
+    is_mid = position == "MID"
+    is_str = position == "STR"
+
+    # Minutes Played
+    points = np.where(minutes < 60, 1, 2)
+
+    # Goal points based on Position
+    goal_points = np.select([is_goa_def, is_mid, is_str], [6, 5, 4], 0)
+    points = points + np.where(_present(df["Goal"]), goal_points, 0)
+
+    # Goal Assist
+    points = points + np.where(_present(df["Goal Assist"]), 3, 0)
+
+    # Clean Sheet points
+    clean_sheet_points = np.select([position == "GOA", position == "DEF", is_mid, is_str], [4, 3, 2, 1], 0)
+    points = points + np.where(minutes > 60, clean_sheet_points, 0)
+
+    # Penalties: missed, saved, provoked, committed
+    points = points - np.where(_present(df["Penalties Missed"]), 2, 0)
+    points = points + np.where(_present(df["Penalties Saved"]), 5, 0)
+    points = points + np.where(df["Penalties Won"].to_numpy() > 0, 2, 0)
+    points = points - np.where(_present(df["Penalties Committed"]), 2, 0)
+
+    # Conceded Goals points
+    conceded = goals_against > 0
+    points = points - np.select(
+        [is_goa_def & conceded, (is_mid | is_str) & conceded],
+        [goals_against // 2 * 2, goals_against // 2],
+        0
+    )
+
+    # Cards
+    points = points - np.where(_present(df["Yellow Card"]), 1, 0)
+    points = points - np.where((red_card == "Second Yellow Card").to_numpy(), 1, 0)
+    points = points - np.where((red_card == "Red Card").to_numpy(), 3, 0)
+
+    # Hodler points
+    points = points + df["Hodler Mark Points"].to_numpy()
+
+    return pd.Series(points, index=df.index, name="Fantasy Points")
+
+
+# ===================== Aggregation =====================
+GROUP_COLUMNS = ['Player Full Name', 'League', 'Season', 'Team', 'Position']
+
+
+def aggregate_fantasy_points(df):
+    """Sum scored match rows per player, league, season, team and position."""
+    grouped_data = df.groupby(GROUP_COLUMNS).agg({
+        'Fantasy Points': 'sum',
+    }).reset_index()
+    grouped_data.set_index('Player Full Name', inplace=True)
+
+    cols = list(grouped_data.columns)
+    cols.remove("Fantasy Points")
+    cols.insert(0, "Fantasy Points")
+    return grouped_data[cols]
+
+
+def build_points_json(grouped_data):
+    """Shape aggregated points the way hodlerfc.json stores them: {player: [entries]}."""
+    json_data = {}
+    for player_name, player_data in grouped_data.iterrows():
+        json_data.setdefault(player_name, []).append(player_data.to_dict())
+    return json_data
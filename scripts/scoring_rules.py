@@ -0,0 +1,147 @@
+import json
+import operator
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from functools import lru_cache
+
+# ===================== Rules Format =====================
+# A rules file is {"name": ..., "rules": [rule, ...]} where each rule is
+#
+#   {"parameter": <match stat column>,
+#    "condition": <condition>,
+#    "positions": [<position>, ...],   # optional, defaults to every position
+#    "points": <points>}
+#
+# and <condition> is one of
+#
+#   "per_unit"                   points for every unit of the stat
+#   "per_row"                    points whenever the stat is recorded (not NaN)
+#   {"op": "<", "value": 60}     points when the comparison holds (<, <=, >, >=, ==, !=)
+#   {"every": 2}                 points for every full multiple of the stat
+#
+# The shipped metadata/scoring_rules.json reproduces scoring.calculate_fantasy_points.
+
+DEFAULT_RULES_PATH = Path("../metadata/scoring_rules.json")
+OTHER_POSITION = "*"
+
+COMPARISONS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def load_rules(path=DEFAULT_RULES_PATH):
+    """Read a rules file. YAML is accepted when PyYAML is installed."""
+    path = Path(path)
+    with open(path) as f:
+        if path.suffix in (".yaml", ".yml"):
+            import yaml
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+# ===================== Compiled Plan =====================
+class ScoringPlan:
+    """
+    Rules compiled into arrays, evaluated as
+
+        points = (X @ W.T)[row, position] + sum(threshold terms) + sum(step terms)
+
+    X holds the linear features (per_unit values and per_row presence flags)
+    and W is a (positions x features) weight matrix. Positions that no rule
+    names explicitly share the OTHER_POSITION row.
+    """
+
+    def __init__(self, rules):
+        positions = sorted({
+            position
+            for rule in rules["rules"]
+            for position in rule.get("positions", [])
+        })
+        self.positions = positions + [OTHER_POSITION]
+        self._position_index = {position: i for i, position in enumerate(self.positions)}
+
+        self.features = []       # [(kind, column)] with kind "value" or "present"
+        linear_weights = []      # [(feature index, position weight vector)]
+        self.thresholds = []     # [(column, op, value, position weight vector)]
+        self.steps = []          # [(column, every, position weight vector)]
+
+        for rule in rules["rules"]:
+            weights = self._position_weights(rule)
+            condition = rule["condition"]
+
+            if condition in ("per_unit", "per_row"):
+                feature = ("value" if condition == "per_unit" else "present", rule["parameter"])
+                if feature not in self.features:
+                    self.features.append(feature)
+                linear_weights.append((self.features.index(feature), weights))
+            elif not isinstance(condition, dict):
+                raise ValueError(f"Unsupported scoring condition for {rule['parameter']!r}: {condition!r}")
+            elif "every" in condition:
+                self.steps.append((rule["parameter"], condition["every"], weights))
+            elif condition.get("op") in COMPARISONS:
+                self.thresholds.append((rule["parameter"], COMPARISONS[condition["op"]], condition["value"], weights))
+            else:
+                raise ValueError(f"Unsupported scoring condition for {rule['parameter']!r}: {condition!r}")
+
+        self.weights = np.zeros((len(self.positions), len(self.features)))
+        for feature_index, weights in linear_weights:
+            self.weights[:, feature_index] += weights
+
+        self.columns = sorted({column for _, column in self.features}
+                              | {column for column, *_ in self.thresholds}
+                              | {column for column, *_ in self.steps})
+
+    def _position_weights(self, rule):
+        weights = np.zeros(len(self.positions))
+        if "positions" in rule:
+            for position in rule["positions"]:
+                weights[self._position_index[position]] = rule["points"]
+        else:
+            weights[:] = rule["points"]
+        return weights
+
+    def position_codes(self, position_column):
+        other = self._position_index[OTHER_POSITION]
+        return position_column.map(self._position_index).fillna(other).to_numpy(dtype=np.intp)
+
+    def evaluate(self, df):
+        """Return a Series of fantasy points, one per match row of df."""
+        codes = self.position_codes(df["Position"])
+        rows = np.arange(len(df))
+
+        features = np.column_stack([
+            df[column].fillna(0).to_numpy(dtype=float) if kind == "value" else df[column].notna().to_numpy(dtype=float)
+            for kind, column in self.features
+        ]) if self.features else np.zeros((len(df), 0))
+        points = (features @ self.weights.T)[rows, codes]
+
+        for column, compare, value, weights in self.thresholds:
+            mask = compare(df[column], value).to_numpy(dtype=bool)
+            points += np.where(mask, weights[codes], 0)
+
+        for column, every, weights in self.steps:
+            values = df[column].fillna(0).to_numpy(dtype=float)
+            points += np.where(values > 0, np.floor_divide(values, every), 0) * weights[codes]
+
+        return pd.Series(points, index=df.index, name="Fantasy Points")
+
+
+@lru_cache(maxsize=32)
+def _compile(canonical_rules):
+    return ScoringPlan(json.loads(canonical_rules))
+
+
+def compile_rules(rules):
+    """Compile a rules dict, reusing the cached plan for identical rules."""
+    return _compile(json.dumps(rules, sort_keys=True))
+
+
+def score_with_rules(df, rules=None):
+    """Score match rows with the given rules (the shipped rules file by default)."""
+    return compile_rules(rules if rules is not None else load_rules()).evaluate(df)
@@ -0,0 +1,191 @@
+import time
+import threading
+from web3.exceptions import TransactionNotFound
+
+# ===================== Transaction Manager =====================
+class TransactionManager:
+    """
+    Submit contract transactions without waiting for them to be mined.
+
+    Nonces are tracked locally per sender and the gas price is cached for a
+    few seconds, so submitting costs one eth_sendTransaction (plus a gas
+    estimate when no gas limit is given). A background thread polls for
+    receipts and records the outcome in a status table the UI can read.
+
+    A transaction the node no longer knows about `drop_after` seconds after
+    submission (replaced, or evicted from the mempool), or still unmined
+    after `max_pending_age`, is marked "dropped" and its sender's nonce is
+    re-read from the node.
+    """
+
+    def __init__(self, w3, poll_interval=1.0, gas_price_ttl=15.0, history=200,
+                 drop_after=120.0, max_pending_age=3600.0):
+        self.w3 = w3
+        self.poll_interval = poll_interval
+        self.gas_price_ttl = gas_price_ttl
+        self.drop_after = drop_after
+        self.max_pending_age = max_pending_age
+        self.history = history
+
+        self._lock = threading.Lock()
+        self._nonces = {}
+        self._gas_price = None
+        self._gas_price_at = 0.0
+        self._transactions = {}
+
+        self._poller = threading.Thread(target=self._poll_receipts, name="tx-receipt-poller", daemon=True)
+        self._poller.start()
+
+    # ---------- Nonces and Gas ----------
+    def _next_nonce(self, sender):
+        with self._lock:
+            if sender not in self._nonces:
+                self._nonces[sender] = self.w3.eth.getTransactionCount(sender, 'pending')
+            nonce = self._nonces[sender]
+            self._nonces[sender] += 1
+            return nonce
+
+    def _resync_nonce(self, sender):
+        with self._lock:
+            self._nonces.pop(sender, None)
+
+    def gas_price(self):
+        with self._lock:
+            if self._gas_price is None or time.monotonic() - self._gas_price_at > self.gas_price_ttl:
+                self._gas_price = self.w3.eth.gasPrice
+                self._gas_price_at = time.monotonic()
+            return self._gas_price
+
+    # ---------- Submission ----------
+    def submit(self, label, contract_function, tx_params, on_confirmed=None):
+        """
+        Send contract_function with tx_params ('from' is required) and return
+        the transaction hash immediately. on_confirmed(receipt), if given, runs
+        on the poller thread and its return value is stored as the message.
+        """
+        params = dict(tx_params)
+        sender = params['from']
+        params.setdefault('gasPrice', self.gas_price())
+        if 'gas' not in params:
+            params['gas'] = contract_function.estimateGas(params)
+
+        for attempt in range(2):
+            params['nonce'] = self._next_nonce(sender)
+            try:
+                tx_hash = contract_function.transact(params).hex()
+                break
+            except ValueError as err:
+                self._resync_nonce(sender)
+                # Someone else used this sender's nonce; retry once with the node's count.
+                if attempt == 0 and "nonce" in str(err).lower():
+                    continue
+                raise
+            except Exception:
+                # e.g. a read timeout: whether the nonce was used is unknown, so ask the node next time
+                self._resync_nonce(sender)
+                raise
+
+        with self._lock:
+            self._transactions[tx_hash] = {
+                "tx_hash": tx_hash,
+                "label": label,
+                "status": "pending",
+                "submitted_at": time.time(),
+                "confirmed_at": None,
+                "block": None,
+                "gas_used": None,
+                "message": "",
+                "receipt": None,
+                "_sender": sender,
+                "_on_confirmed": on_confirmed,
+            }
+            self._trim_history()
+        return tx_hash
+
+    # ---------- Status Table ----------
+    def status(self, tx_hash):
+        with self._lock:
+            entry = self._transactions.get(tx_hash)
+            return self._public(entry) if entry else None
+
+    def statuses(self):
+        """All tracked transactions, newest first."""
+        with self._lock:
+            entries = sorted(self._transactions.values(), key=lambda entry: entry["submitted_at"], reverse=True)
+            return [self._public(entry) for entry in entries]
+
+    def pending_count(self):
+        with self._lock:
+            return sum(1 for entry in self._transactions.values() if entry["status"] == "pending")
+
+    @staticmethod
+    def _public(entry):
+        return {key: value for key, value in entry.items() if not key.startswith("_")}
+
+    def _trim_history(self):
+        finished = sorted(
+            (entry for entry in self._transactions.values() if entry["status"] != "pending"),
+            key=lambda entry: entry["submitted_at"]
+        )
+        for entry in finished[:max(0, len(self._transactions) - self.history)]:
+            del self._transactions[entry["tx_hash"]]
+
+    # ---------- Receipt Poller ----------
+    def _poll_receipts(self):
+        while True:
+            with self._lock:
+                pending = [(tx_hash, entry["submitted_at"]) for tx_hash, entry in self._transactions.items()
+                           if entry["status"] == "pending"]
+
+            for tx_hash, submitted_at in pending:
+                try:
+                    receipt = self.w3.eth.getTransactionReceipt(tx_hash)
+                except TransactionNotFound:
+                    receipt = None
+                except Exception as err:
+                    print(f"Error polling receipt for {tx_hash}: {err}")
+                    continue
+                if receipt is not None:
+                    self._record_receipt(tx_hash, receipt)
+                else:
+                    self._check_dropped(tx_hash, time.time() - submitted_at)
+
+            time.sleep(self.poll_interval)
+
+    def _check_dropped(self, tx_hash, age):
+        if age > self.max_pending_age:
+            self._record_dropped(tx_hash, f"Not mined after {self.max_pending_age:.0f} s")
+        elif age > self.drop_after:
+            try:
+                self.w3.eth.getTransaction(tx_hash)
+            except TransactionNotFound:
+                self._record_dropped(tx_hash, "Dropped or replaced by the node")
+            except Exception as err:
+                print(f"Error checking transaction {tx_hash}: {err}")
+
+    def _record_dropped(self, tx_hash, message):
+        with self._lock:
+            entry = self._transactions[tx_hash]
+            entry.update(status="dropped", message=message)
+            self._trim_history()
+        self._resync_nonce(entry["_sender"])
+
+    def _record_receipt(self, tx_hash, receipt):
+        with self._lock:
+            entry = self._transactions[tx_hash]
+            entry.update(
+                status="confirmed" if receipt['status'] else "failed",
+                confirmed_at=time.time(),
+                block=receipt['blockNumber'],
+                gas_used=receipt['gasUsed'],
+                receipt=dict(receipt)
+            )
+            on_confirmed = entry["_on_confirmed"]
+
+        if on_confirmed and receipt['status']:
+            try:
+                message = on_confirmed(receipt)
+            except Exception as err:
+                message = f"Confirmation handler failed: {err}"
+            with self._lock:
+                entry["message"] = message or ""